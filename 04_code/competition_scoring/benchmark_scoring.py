@@ -0,0 +1,92 @@
+# This script measures score_st2 on a synthetic submission (default 1M rows)
+# with the former per-row implementation (two scipy jensenshannon calls per
+# id) and the vectorized one in scoring.py, and checks that both return the
+# same scores. The validation (check_dist, check_allowed) is timed on its
+# own.
+# Start: python benchmark_scoring.py --rows 1000000
+
+# Date: October 17, 2026
+
+import argparse
+import time
+import numpy as np
+from scipy.spatial import distance
+from scoring import (DIST_BIN_COLUMNS, DIST_MULTI_COLUMNS, MULT_LABELS,
+                     check_allowed, check_dist, score_st2)
+
+
+def score_st2_loop(data, targets):
+    """score_st2 before the vectorization (without the validation)"""
+    scores = {}
+    sum_bin = 0.0
+    sum_multi = 0.0
+    for idx in range(len(data['id'])):
+        dist_bin = [float(data['dist_bin_0'][idx]),
+                    float(data['dist_bin_1'][idx])]
+        dist_multi = [float(data[colname][idx])
+                      for colname in DIST_MULTI_COLUMNS]
+        target_bin = [targets['dist_bin_0'][idx], targets['dist_bin_1'][idx]]
+        target_multi = [targets[colname][idx]
+                        for colname in DIST_MULTI_COLUMNS]
+        sum_bin += distance.jensenshannon(dist_bin, target_bin, base=2)
+        sum_multi += distance.jensenshannon(dist_multi, target_multi, base=2)
+    scores['js_dist_bin'] = sum_bin / len(data['id'])
+    scores['js_dist_multi'] = sum_multi / len(data['id'])
+    scores['score'] = np.mean([scores['js_dist_bin'], scores['js_dist_multi']])
+    return scores
+
+
+def random_dists(rng, rows, size):
+    """Distributions as the TSV maker writes them: rounded, rows sum to 1"""
+    dists = np.round(rng.dirichlet(np.ones(size), rows), 4)
+    dists[:, -1] = np.round(1.0 - dists[:, :-1].sum(axis=1), 4)
+    return np.clip(dists, 0.0, 1.0)
+
+
+def synthetic_submission(rows, seed=0):
+    """Submission (strings like a loaded TSV) and targets (floats)"""
+    rng = np.random.default_rng(seed)
+    data = {'id': [f"id{i}" for i in range(rows)]}
+    targets = {}
+    for columns in (DIST_BIN_COLUMNS, DIST_MULTI_COLUMNS):
+        predicted = random_dists(rng, rows, len(columns))
+        target = random_dists(rng, rows, len(columns))
+        for number, column in enumerate(columns):
+            data[column] = [str(value) for value in predicted[:, number]]
+            targets[column] = target[:, number].tolist()
+    return data, targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of score_st2')
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"Building a synthetic submission with {args.rows} rows")
+    data, targets = synthetic_submission(args.rows)
+
+    start = time.perf_counter()
+    check_dist(data, DIST_BIN_COLUMNS)
+    check_dist(data, DIST_MULTI_COLUMNS)
+    labels = np.random.default_rng(0).choice(MULT_LABELS, args.rows)
+    check_allowed({'id': data['id'], 'multi_maj': labels}, 'multi_maj',
+                  MULT_LABELS)
+    print(f"validation: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    vectorized = score_st2(data, targets)
+    vectorized_time = time.perf_counter() - start
+    print(f"vectorized: {vectorized_time:.2f}s (with validation)")
+
+    start = time.perf_counter()
+    loop = score_st2_loop(data, targets)
+    loop_time = time.perf_counter() - start
+    print(f"per row:    {loop_time:.2f}s (without validation)")
+
+    assert vectorized == loop, (vectorized, loop)
+    print(f"Same scores {vectorized}, {loop_time / vectorized_time:.1f}x "
+          "faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+# This script estimates how certain the competition scores of the runs are.
+# For every run under a results folder (*_ST1.tsv and *_ST2.tsv as for
+# scoring.py --batch) it computes bootstrap confidence intervals of every
+# subtask 1 F1 column, the subtask 1 score, both Jensen-Shannon distances and
+# the subtask 2 score, and for every pair of runs a paired permutation test
+# (approximate randomization) of the differences.
+# The resamples are weight matrices (how often each id is drawn), so one
+# matrix product gives the confusion matrices and distance sums of a whole
+# chunk of resamples; the chunks run in parallel processes.
+# Start: python bootstrap_scores.py --results-dir ../../05_results/result_runs
+
+# Date: October 17, 2026
+
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scoring import (COLUMN_LABELS, ST1_COLUMNS, ST2_COLUMNS, align_targets,
+                     find_submissions, load_targets, load_tsv, st1_codes,
+                     st2_distances)
+
+GLOBALS = dict()
+F1_COLUMNS = ST1_COLUMNS[1:]
+JS_COLUMNS = ['js_dist_bin', 'js_dist_multi']
+
+
+def item_matrix(run_dir, submissions, targets):
+    """Per id values of one run as (n, features) matrix, rows sorted by id,
+    and the layout of the features. A subtask 1 column is the one hot
+    encoded pair (prediction, target), so the column sums are its confusion
+    matrix; a subtask 2 column is the distance of the id. Returns None if a
+    submission can not be loaded."""
+    blocks = []
+    layout = []
+    start = 0
+    for file, subtask in submissions:
+        columns = ST1_COLUMNS if subtask == "1" else ST2_COLUMNS
+        data = load_tsv(run_dir, expected_rows=len(targets),
+                        expected_cols=columns, file=file)
+        if data is None:
+            return None
+        if set(data['id']) != {target['id'] for target in targets}:
+            print(f"IDs in {file} do not match IDs in targets",
+                  file=sys.stderr)
+            return None
+        targets_dir = align_targets(targets, data['id'], data.keys())
+        if targets_dir is None:
+            return None
+        order = np.argsort(np.asarray(data['id']))
+        if subtask == "1":
+            predictions, target_codes = st1_codes(data, targets_dir)
+            for column in F1_COLUMNS:
+                k = len(COLUMN_LABELS[column])
+                pairs = (predictions[column].astype(np.intp) * k
+                         + target_codes[column])[order]
+                onehot = np.zeros((len(pairs), k * k))
+                onehot[np.arange(len(pairs)), pairs] = 1.0
+                blocks.append(onehot)
+                layout.append((column, k, slice(start, start + k * k)))
+                start += k * k
+        else:
+            for column, distances in zip(JS_COLUMNS,
+                                         st2_distances(data, targets_dir)):
+                blocks.append(distances[order][:, np.newaxis])
+                layout.append((column, None, slice(start, start + 1)))
+                start += 1
+    return np.hstack(blocks), layout
+
+
+def metrics(sums, layout, n):
+    """Scores of the rows of sums (column sums of the item matrix, weighted
+    by one resample each): macro F1 like sklearn (labels neither predicted
+    nor true are left out), mean distance, and the two subtask scores."""
+    values = {}
+    for column, k, columns in layout:
+        if k is None:
+            values[column] = sums[:, columns][:, 0] / n
+            continue
+        confusion = sums[:, columns].reshape(-1, k, k)
+        tp = np.diagonal(confusion, axis1=1, axis2=2)
+        # 2 * tp + fp + fn
+        denominator = confusion.sum(axis=2) + confusion.sum(axis=1)
+        present = denominator > 0
+        f1 = np.divide(2 * tp, denominator, out=np.zeros_like(tp),
+                       where=present)
+        values[column + "_f1"] = f1.sum(axis=1) / present.sum(axis=1)
+    if all(column + "_f1" in values for column in F1_COLUMNS):
+        values['st1_score'] = np.mean(
+            [values[column + "_f1"] for column in F1_COLUMNS], axis=0)
+    if all(column in values for column in JS_COLUMNS):
+        values['st2_score'] = np.mean(
+            [values[column] for column in JS_COLUMNS], axis=0)
+    return values
+
+
+def init_worker(runs):
+    GLOBALS['runs'] = runs
+
+
+def bootstrap_chunk(task):
+    """Scores of size bootstrap resamples of the ids of one run"""
+    run, seed, size = task
+    items, layout = GLOBALS['runs'][run]
+    n = len(items)
+    rng = np.random.default_rng(seed)
+    weights = rng.multinomial(n, np.full(n, 1.0 / n), size=size)
+    return run, metrics(weights @ items, layout, n)
+
+
+def permutation_chunk(task):
+    """Count of size random swaps of the predictions of two runs (per id with
+    probability 0.5) with a difference at least as large as the observed"""
+    run_a, run_b, seed, size = task
+    items_a, layout = GLOBALS['runs'][run_a]
+    items_b, _ = GLOBALS['runs'][run_b]
+    n = len(items_a)
+    rng = np.random.default_rng(seed)
+    swap = rng.integers(0, 2, size=(size, n)).astype(np.float64)
+    sums_a = items_a.sum(axis=0)
+    sums_b = items_b.sum(axis=0)
+    moved = swap @ (items_b - items_a)
+    observed = diff(metrics(sums_a[np.newaxis], layout, n),
+                    metrics(sums_b[np.newaxis], layout, n))
+    permuted = diff(metrics(sums_a + moved, layout, n),
+                    metrics(sums_b - moved, layout, n))
+    counts = {metric: int(np.sum(np.abs(permuted[metric])
+                                 >= np.abs(observed[metric][0]) - 1e-12))
+              for metric in observed}
+    return run_a, run_b, counts
+
+
+def diff(values_a, values_b):
+    return {metric: values_a[metric] - values_b[metric]
+            for metric in values_a}
+
+
+def chunk_sizes(total, chunk):
+    return [min(chunk, total - start) for start in range(0, total, chunk)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Bootstrap confidence intervals and paired significance '
+        'of the competition scores')
+    parser.add_argument("--results-dir", required=True,
+                        help='Folder with the runs, e.g. '
+                        '../../05_results/result_runs')
+    parser.add_argument("--targets", default="../../01_data/targets.json")
+    parser.add_argument("--resamples", type=int, default=10000,
+                        help='Bootstrap resamples per run')
+    parser.add_argument("--permutations", type=int, default=10000,
+                        help='Random swaps per pair of runs')
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--chunk", type=int, default=500,
+                        help='Resamples per task of a process')
+    parser.add_argument("--workers", type=int,
+                        help='Processes, default: number of CPUs')
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    targets = load_targets(args.targets)
+    print(f"Loaded {len(targets)} targets")
+    submissions = {}
+    for run_dir, file, subtask in find_submissions(args.results_dir):
+        submissions.setdefault(run_dir, []).append((file, subtask))
+    runs = {}
+    for run_dir, files in submissions.items():
+        run = os.path.relpath(run_dir, args.results_dir)
+        loaded = item_matrix(run_dir, files, targets)
+        if loaded is None:
+            print(f"Skipping run {run}", file=sys.stderr)
+            continue
+        runs[run] = loaded
+    names = sorted(runs)
+    print(f"Loaded {len(names)} runs")
+
+    # only runs with the same subtasks can be compared
+    pairs = [(run_a, run_b) for i, run_a in enumerate(names)
+             for run_b in names[i + 1:]
+             if runs[run_a][1] == runs[run_b][1]]
+    # an independent random stream for every task
+    seeds = iter(np.random.SeedSequence(args.seed).spawn(
+        len(names) * len(chunk_sizes(args.resamples, args.chunk))
+        + len(pairs) * len(chunk_sizes(args.permutations, args.chunk))))
+    bootstrap_tasks = [(run, next(seeds), size) for run in names
+                       for size in chunk_sizes(args.resamples, args.chunk)]
+    permutation_tasks = [(run_a, run_b, next(seeds), size)
+                         for run_a, run_b in pairs
+                         for size in chunk_sizes(args.permutations,
+                                                 args.chunk)]
+
+    resampled = {run: {} for run in names}
+    counts = {pair: {} for pair in pairs}
+    with ProcessPoolExecutor(max_workers=args.workers,
+                             initializer=init_worker,
+                             initargs=(runs,)) as pool:
+        for run, values in pool.map(bootstrap_chunk, bootstrap_tasks):
+            for metric, value in values.items():
+                resampled[run].setdefault(metric, []).append(value)
+        for run_a, run_b, chunk_counts in pool.map(permutation_chunk,
+                                                   permutation_tasks):
+            for metric, count in chunk_counts.items():
+                counts[(run_a, run_b)][metric] = counts[(run_a, run_b)].get(
+                    metric, 0) + count
+
+    alpha = 1.0 - args.confidence
+    point = {run: {metric: value[0] for metric, value in metrics(
+        runs[run][0].sum(axis=0)[np.newaxis], runs[run][1],
+        len(runs[run][0])).items()} for run in names}
+    ci_file = os.path.join(args.results_dir, 'bootstrap_ci.tsv')
+    with open(ci_file, 'w', newline='', encoding="utf-8") as outfp:
+        writer = csv.writer(outfp, delimiter='\t')
+        writer.writerow(['run', 'metric', 'score', 'ci_low', 'ci_high'])
+        for run in names:
+            for metric, chunks in resampled[run].items():
+                low, high = np.quantile(np.concatenate(chunks),
+                                        [alpha / 2, 1.0 - alpha / 2])
+                writer.writerow([run, metric, f"{point[run][metric]:.4f}",
+                                 f"{low:.4f}", f"{high:.4f}"])
+                print(f"{run:<45} {metric:<18} {point[run][metric]:.4f} "
+                      f"[{low:.4f}, {high:.4f}]")
+    print(f"Confidence intervals written to {ci_file}")
+
+    significance_file = os.path.join(args.results_dir, 'significance.tsv')
+    with open(significance_file, 'w', newline='',
+              encoding="utf-8") as outfp:
+        writer = csv.writer(outfp, delimiter='\t')
+        writer.writerow(['run_a', 'run_b', 'metric', 'difference',
+                         'p_value'])
+        for run_a, run_b in pairs:
+            for metric, count in counts[(run_a, run_b)].items():
+                p_value = (count + 1) / (args.permutations + 1)
+                writer.writerow([run_a, run_b, metric,
+                                 f"{point[run_a][metric]
+                                    - point[run_b][metric]:.4f}",
+                                 f"{p_value:.4f}"])
+    print(f"Paired permutation tests of {len(pairs)} pairs written to "
+          f"{significance_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+# This script scores a run directly from its predictions (result.jsonl) for
+# subtask 1 and subtask 2 in one command: the predictions are read once into
+# label count arrays, the columns of both subtasks are computed from them
+# and handed to the scoring functions of scoring.py, without writing and
+# reading TSV files in between. With --write-tsv the competition TSV files
+# are written too (same as tsv_maker.py).
+# Start: python score_predictions.py
+#            --input ../../03_input/[model]/result.jsonl
+#            --targets ../../01_data/targets.json
+
+# Date: October 17, 2026
+
+import argparse
+import csv
+import json
+import os
+import sys
+import numpy as np
+from scoring import (DIST_MULTI_COLUMNS, MULT_LABELS, ST1_COLUMNS,
+                     ST2_COLUMNS, align_targets, load_targets, score_st1,
+                     score_st2)
+from tsv_maker import read_counts
+
+# corpus_store.py (converted .corpus folders) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from corpus_store import Corpus, is_corpus  # noqa: E402
+
+
+def read_label_arrays(input_file):
+    """ids, label counts (n, labels) and the position of the first
+    appearance of every label in the annotations of a text (n, labels), the
+    number of labels if it does not appear"""
+    if is_corpus(input_file):
+        return corpus_label_arrays(input_file)
+    k = len(MULT_LABELS)
+    ids = []
+    counts = []
+    first = []
+    for id_, (item_counts, first_seen) in read_counts(input_file):
+        ids.append(id_)
+        counts.append(item_counts)
+        positions = [k] * k
+        for position, code in enumerate(first_seen):
+            positions[code] = position
+        first.append(positions)
+    counts = np.array(counts, dtype=np.int64).reshape(-1, k)
+    first = np.array(first, dtype=np.int64).reshape(-1, k)
+    empty = np.flatnonzero(counts.sum(axis=1) == 0)
+    if empty.size > 0:
+        raise ValueError(f"No annotations for id {ids[empty[0]]} in "
+                         f"{input_file}")
+    return ids, counts, first
+
+
+def corpus_label_arrays(corpus_path):
+    """read_label_arrays of a converted .corpus folder, from its annotation
+    arrays without parsing"""
+    corpus = Corpus(corpus_path)
+    k = len(MULT_LABELS)
+    ids = corpus.id_list()
+    labels = np.asarray(corpus.label_codes, dtype=np.int64)
+    if (labels < 0).any():
+        raise ValueError(f"Annotations without label in {corpus_path}")
+    entries = corpus.annotation_entries()
+    position = np.arange(len(labels)) - \
+        np.asarray(corpus.annotation_offsets)[entries]
+    counts = np.zeros((len(ids), k), dtype=np.int64)
+    np.add.at(counts, (entries, labels), 1)
+    first = np.full((len(ids), k), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, (entries, labels), position)
+    # like label_counts: the position among the distinct labels of a text
+    first = np.argsort(np.argsort(first, axis=1), axis=1)
+    first[counts == 0] = k
+    empty = np.flatnonzero(counts.sum(axis=1) == 0)
+    if empty.size > 0:
+        raise ValueError(f"No annotations for id {ids[empty[0]]} in "
+                         f"{corpus_path}")
+    return ids, counts, first
+
+
+def st1_data(ids, counts, first):
+    """Subtask 1 columns as loaded by scoring.load_tsv (codes), the majority
+    is the label seen first on equal counts like in ST_1_tsv_maker.py"""
+    k = counts.shape[1]
+    # a count difference outweighs any difference of the first position
+    majority = np.argmax(counts * (k + 1) - first, axis=1)
+    labelled = counts[:, 1:].sum(axis=1)
+    return {
+        'id': ids,
+        'bin_maj': (majority != 0).astype(np.int8),
+        'bin_one': (labelled > 0).astype(np.int8),
+        'bin_all': (counts[:, 0] == 0).astype(np.int8),
+        'multi_maj': majority.astype(np.int8),
+        'disagree_bin': ((labelled > 0) & (counts[:, 0] > 0)).astype(np.int8)
+    }
+
+
+def st2_data(ids, counts):
+    """Subtask 2 distributions as loaded by scoring.load_tsv (float64)"""
+    total = counts.sum(axis=1)
+    data = {'id': ids,
+            'dist_bin_0': counts[:, 0] / total,
+            'dist_bin_1': counts[:, 1:].sum(axis=1) / total}
+    for code, column in enumerate(DIST_MULTI_COLUMNS):
+        data[column] = counts[:, code] / total
+    return data
+
+
+def write_tsv(tsv_file, columns, data):
+    """Write the columns as competition TSV, the multi_maj codes as labels"""
+    values = []
+    for column in columns:
+        if column == 'id':
+            values.append(data[column])
+        elif column == 'multi_maj':
+            values.append([MULT_LABELS[code] for code in data[column]])
+        else:
+            values.append(data[column].tolist())
+    with open(tsv_file, 'w', newline='', encoding='utf-8') as outfp:
+        writer = csv.writer(outfp, delimiter='\t', lineterminator='\n')
+        writer.writerow(columns)
+        writer.writerows(zip(*values))
+    print(f"Written {tsv_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Score the predictions of a run (result.jsonl)')
+    parser.add_argument("--input", required=True,
+                        help='result.jsonl with the predictions')
+    parser.add_argument("--targets", default="../../01_data/targets.json")
+    parser.add_argument("--st", choices=["1", "2"],
+                        help='Only this subtask, default: both')
+    parser.add_argument("--score-dir",
+                        help='Folder for scores_ST1.json and scores_ST2.json'
+                        ', default: folder of the input')
+    parser.add_argument("--write-tsv", action='store_true',
+                        help='Also write results_st1.tsv and results_st2.tsv '
+                        'into the score dir')
+    args = parser.parse_args()
+    score_dir = args.score_dir or os.path.dirname(args.input)
+    subtasks = [args.st] if args.st else ["1", "2"]
+
+    targets = load_targets(args.targets)
+    print(f"Loaded {len(targets)} targets")
+    ids, counts, first = read_label_arrays(args.input)
+    print(f"Loaded {len(ids)} predictions from {args.input}")
+
+    # Check if the IDs of the predictions match the targets
+    if len(ids) != len(targets) or set(ids) != {target['id']
+                                                for target in targets}:
+        print("IDs in predictions do not match IDs in targets",
+              file=sys.stderr)
+        sys.exit(1)
+
+    for subtask in subtasks:
+        if subtask == "1":
+            columns, data = ST1_COLUMNS, st1_data(ids, counts, first)
+        else:
+            columns, data = ST2_COLUMNS, st2_data(ids, counts)
+        if args.write_tsv:
+            write_tsv(os.path.join(score_dir, f"results_st{subtask}.tsv"),
+                      columns, data)
+        targets_dir = align_targets(targets, ids, columns)
+        if targets_dir is None:
+            sys.exit(1)
+        if subtask == "1":
+            scores = score_st1(data, targets_dir)
+        else:
+            scores = score_st2(data, targets_dir)
+        print(f"Scores (ST{subtask}):", scores)
+        with open(os.path.join(score_dir, f'scores_ST{subtask}.json'), 'w',
+                  encoding="utf-8") as score_file:
+            score_file.write(json.dumps(scores))
+
+
+if __name__ == '__main__':
+    main()
@@ -14,9 +14,9 @@ import sys
 import os
 import json
 import csv
-from collections import defaultdict
 import numpy as np
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.metrics import accuracy_score, f1_score
 from scipy.spatial import distance
 
@@ -26,11 +26,20 @@ EPS = 0.001
 # distribution that sums to 1.0
 
 MULT_LABELS = ["0-Kein", "1-Gering", "2-Vorhanden", "3-Stark", "4-Extrem"]
+BIN_LABELS = ["0", "1"]
 
 ST1_COLUMNS = ['id', 'bin_maj', 'bin_one',
                'bin_all', 'multi_maj', 'disagree_bin']
 ST2_COLUMNS = ['id', 'dist_bin_0', 'dist_bin_1', 'dist_multi_0',
                'dist_multi_1', 'dist_multi_2', 'dist_multi_3', 'dist_multi_4']
+DIST_BIN_COLUMNS = ['dist_bin_0', 'dist_bin_1']
+DIST_MULTI_COLUMNS = ['dist_multi_0', 'dist_multi_1', 'dist_multi_2',
+                      'dist_multi_3', 'dist_multi_4']
+# labels of the categorical columns, loaded as codes (index in the list),
+# so the codes of the binary columns are the values 0 and 1
+COLUMN_LABELS = {'bin_maj': BIN_LABELS, 'bin_one': BIN_LABELS,
+                 'bin_all': BIN_LABELS, 'multi_maj': MULT_LABELS,
+                 'disagree_bin': BIN_LABELS}
 
 
 def load_targets(targets_file):
@@ -61,13 +70,69 @@ def check_allowed(data, column, allowed=None):
         allowed = ["0", "1"]
     if column not in data:
         raise ValueError(f"Column {column} not found in data")
-    for i, value in enumerate(data[column]):
-        if value not in allowed:
-            raise ValueError(f"Invalid value {value} not one of {allowed} in column {  # noqa: E501
-                             column} at index {i} with id {data['id'][i]}")
+    values = data[column]
+    if is_codes(values):
+        # already loaded as codes, index in allowed
+        invalid = np.flatnonzero((values < 0) | (values >= len(allowed)))
+    else:
+        invalid = np.flatnonzero(~np.isin(np.asarray(values), allowed))
+    if invalid.size > 0:
+        i = invalid[0]
+        raise ValueError(f"Invalid value {values[i]} not one of {allowed} "
+                         f"in column {column} at index {i} with id "
+                         f"{data['id'][i]}")
     print(f"Column {column} is OK")
 
 
+def is_codes(values):
+    """True if the column was already loaded as integer codes"""
+    return isinstance(values, np.ndarray) and values.dtype.kind == 'i'
+
+
+def label_codes(data, column, labels):
+    """Check the column with check_allowed and return it as int8 array of
+    codes, the index of each value in labels."""
+    values = data[column]
+    if is_codes(values):
+        return values
+    check_allowed(data, column, labels)
+    lookup = {label: code for code, label in enumerate(labels)}
+    return np.fromiter((lookup[value] for value in values), dtype=np.int8,
+                       count=len(values))
+
+
+def not_float_error(data, column, i):
+    return ValueError(f"Invalid value {data[column][i]} not a float "
+                      f"in column {column} at index {i} with id "
+                      f"{data['id'][i]}")
+
+
+def float_column(values):
+    """Return the values as float64 array (parsed with float() like before)
+    and a mask of the values that are not a float (NaN in the array)."""
+    not_float = np.zeros(len(values), dtype=bool)
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return values, not_float
+    try:
+        return np.fromiter(map(float, values), dtype=np.float64,
+                           count=len(values)), not_float
+    except ValueError:
+        parsed = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                parsed[i] = np.nan
+                not_float[i] = True
+        return parsed, not_float
+
+
+def first_index(mask):
+    """Index of the first True value, len(mask) if there is none"""
+    index = np.argmax(mask)
+    return int(index) if mask[index] else len(mask)
+
+
 def check_dist(data, columns):
     """Check if the predictions are in the allowed range, if not, print an
     error message to stderr also showing the id and throw an exception.
@@ -75,23 +140,33 @@ def check_dist(data, columns):
     for column in columns:
         if column not in data:
             raise ValueError(f"Column {column} not found in data")
-    for i in range(len(data["id"])):
-        sum = 0.0
-        theid = data["id"][i]
-        for column in columns:
-            try:
-                value = float(data[column][i])
-            except ValueError:
-                raise ValueError(f"Invalid value {data[column][i]} not a float in column {  # noqa: E501
-                                 column} at index {i} with id {theid}")
-            if value < 0.0 or value > 1.0:
-                raise ValueError(f"Invalid value {value} not in range [0.0, 1.0] in column {  # noqa: E501
-                                 column} at index {i} with id {data['id'][i]}")
-            sum += value
-        if abs(sum - 1.0) > EPS:
-            raise ValueError(f"Values in columns {
-                             columns} do not sum to 1.0 at index {
-                                 i} with id {theid}")
+    n = len(data["id"])
+    if n == 0:
+        return
+    parsed = [float_column(data[column]) for column in columns]
+    values = np.column_stack([value for value, _ in parsed])
+    not_float = np.column_stack([mask for _, mask in parsed])
+    out_of_range = (values < 0.0) | (values > 1.0)
+    # sum in column order like the former per-row loop
+    sums = np.zeros(n)
+    for number in range(len(columns)):
+        sums = sums + values[:, number]
+    # the rows are checked in order, in a row first every cell, then the sum
+    bad_cell = not_float | out_of_range
+    cell_row = first_index(bad_cell.any(axis=1))
+    sum_row = first_index(np.abs(sums - 1.0) > EPS)
+    if cell_row < n and cell_row <= sum_row:
+        i = cell_row
+        number = first_index(bad_cell[i])
+        column = columns[number]
+        if not_float[i, number]:
+            raise not_float_error(data, column, i)
+        raise ValueError(f"Invalid value {values[i, number]} not in range "
+                         f"[0.0, 1.0] in column {column} at index {i} with "
+                         f"id {data['id'][i]}")
+    if sum_row < n:
+        raise ValueError(f"Values in columns {columns} do not sum to 1.0 at "
+                         f"index {sum_row} with id {data['id'][sum_row]}")
 
 
 def load_tsv(submission_dir, expected_rows, expected_cols, file=None):
@@ -118,36 +193,94 @@ def load_tsv(submission_dir, expected_rows, expected_cols, file=None):
         tsv_file = tsv_files[0]
     tsv_path = os.path.join(submission_dir, tsv_file)
     print("Loading TSV file", tsv_path)
-    # Read the TSV file incrementally row by row and create a dictionary where
-    # the key is the column name and the value is a list of values for that
-    # column.
+    # Read the TSV file incrementally row by row into one list of values per
+    # column, then convert every column at once to a typed array (see
+    # typed_columns).
     # Expect the column names in the first row of the TSV file.
     # Abort reading and log an error to stderr if the file is not a valid TSV
-    # file, if it contains more than one row with the same id,
-    # if the column name is not known, or if there are more than N_MAX rows.
-    data = defaultdict(list)
+    # file, if the column name is not known, if a row has a different number
+    # of values, or if there are more than expected_rows rows.
     print(tsv_path)
     with open(tsv_path, 'rt', encoding="utf-8") as infp:
-        reader = csv.DictReader(infp, delimiter='\t')
+        reader = csv.reader(infp, delimiter='\t')
+        fieldnames = next(reader, [])
+        if set(fieldnames) != set(expected_cols):
+            gotcols = ", ".join(list(set(fieldnames)))
+            print(f"Invalid column names in TSV file, expected:\n  {
+                  ', '.join(expected_cols)}\ngot\n  {gotcols}",
+                  file=sys.stderr)
+            return None
+        columns = [[] for _ in fieldnames]
+        appends = [column.append for column in columns]
         for i, row in enumerate(reader):
-            if i == 0:
-                if set(reader.fieldnames) != set(expected_cols):
-                    gotcols = ", ".join(list(set(reader.fieldnames)))
-                    print(f"Invalid column names in TSV file, expected:\n  {
-                          ', '.join(expected_cols)}\ngot\n  {gotcols}",
-                          file=sys.stderr)
-                    return None
             if i >= expected_rows:
                 print(f"Too many rows in TSV file, expected {
                       expected_rows}", file=sys.stderr)
                 return None
-            for col_name in reader.fieldnames:
-                data[col_name].append(row[col_name])
+            if len(row) != len(fieldnames):
+                print(f"Invalid number of values in TSV file in row {
+                      i + 1}, expected {len(fieldnames)}, got {len(row)}",
+                      file=sys.stderr)
+                return None
+            for append, value in zip(appends, row):
+                append(value)
+    data = dict(zip(fieldnames, columns))
     if len(data['id']) != expected_rows:
         print(f"Missing values in TSV file, expected {
               expected_rows} rows, got {len(data['id'])}", file=sys.stderr)
         return None
-    return data
+    return typed_columns(data)
+
+
+def typed_columns(data):
+    """Convert the columns of a loaded submission: the categorical columns
+    (COLUMN_LABELS) to int8 codes, the dist columns to float64, the ids stay
+    a list of strings. Raises the ValueError of check_allowed or check_dist
+    for a value that is not allowed or not a float."""
+    typed = {}
+    for column, values in data.items():
+        if column in COLUMN_LABELS:
+            typed[column] = label_codes(data, column, COLUMN_LABELS[column])
+        elif column.startswith('dist_'):
+            parsed, not_float = float_column(values)
+            if not_float.any():
+                raise not_float_error(data, column, first_index(not_float))
+            typed[column] = parsed
+        else:
+            typed[column] = values
+    return typed
+
+
+def align_targets(targets, ids, columns):
+    """Align the targets (list of dicts as in targets.json) with the ids of
+    the submission: one index join from id to position, then each column is
+    taken in submission order. The dist columns are float64 arrays, the
+    others lists (a target can be a list of several correct values).
+    Returns None and logs an error to stderr if an id or column is missing."""
+    index = {target['id']: position
+             for position, target in enumerate(targets)}
+    positions = []
+    for idx, id in enumerate(ids):
+        if id not in index:
+            print(f"ID {id} not found in targets for id {
+                  id} in row {idx}", file=sys.stderr)
+            return None
+        positions.append(index[id])
+    aligned = {}
+    for col_name in columns:
+        if col_name == 'id':
+            continue
+        missing = [target['id'] for target in targets
+                   if col_name not in target]
+        if missing:
+            print(f"Column {col_name} not found in targets for id {
+                  missing[0]}", file=sys.stderr)
+            return None
+        values = [targets[position][col_name] for position in positions]
+        if col_name.startswith('dist_'):
+            values = np.asarray(values, dtype=np.float64)
+        aligned[col_name] = values
+    return aligned
 
 
 def score_st1(data, targets):
@@ -163,32 +296,8 @@ def score_st1(data, targets):
     # predict a correct one
 
     check_columns(data, ST1_COLUMNS)
-    check_allowed(data, 'bin_maj', ["0", "1"])
-    check_allowed(data, 'bin_one', ["0", "1"])
-    check_allowed(data, 'bin_all', ["0", "1"])
-    check_allowed(data, 'multi_maj', MULT_LABELS)
-    check_allowed(data, 'disagree_bin', ["0", "1"])
-
-    target_bin_maj = []
-    for pred, target in zip(data['bin_maj'], targets['bin_maj']):
-        if isinstance(target, list):
-            target_bin_maj.append(pred)
-        else:
-            target_bin_maj.append(target)
-    targets['bin_maj'] = target_bin_maj
-
-    target_multi_maj = []
-    for pred, target in zip(data['multi_maj'], targets['multi_maj']):
-        if isinstance(target, list):
-            if pred not in target:
-                # select a random incorrect target: just pick the first one
-                target_multi_maj.append(target[0])
-            else:
-                # the prediction is correct
-                target_multi_maj.append(pred)
-        else:
-            target_multi_maj.append(target)
-    targets['multi_maj'] = target_multi_maj
+    predictions, targets = st1_codes(data, targets)
+    data = dict(data, **predictions)
 
     scores = {}
     used_scores = []
@@ -207,39 +316,201 @@ def score_st1(data, targets):
     return scores
 
 
+def st1_codes(data, targets):
+    """Codes of the predictions and of the resolved targets (one per row) of
+    every subtask 1 column, as two dicts of int8 arrays."""
+    predictions = {column: label_codes(data, column, COLUMN_LABELS[column])
+                   for column in ST1_COLUMNS if column != 'id'}
+    # the binary predictions are always correct if several targets are allowed
+    codes = {'bin_maj': target_codes(predictions['bin_maj'],
+                                     targets['bin_maj'], BIN_LABELS,
+                                     prediction_correct=True)}
+    for column in ('bin_one', 'bin_all', 'multi_maj', 'disagree_bin'):
+        codes[column] = target_codes(predictions[column], targets[column],
+                                     COLUMN_LABELS[column])
+    return predictions, codes
+
+
+def target_codes(predictions, targets, labels, prediction_correct=False):
+    """Codes of the target labels in the order of the predictions. A target
+    can be a list of several correct labels: then the prediction if it is one
+    of them (or always, with prediction_correct), otherwise a random incorrect
+    one, just the first of the list."""
+    lookup = {label: code for code, label in enumerate(labels)}
+    codes = np.empty(len(predictions), dtype=np.int8)
+    for i, target in enumerate(targets):
+        if isinstance(target, list):
+            target_list = [lookup[str(label)] for label in target]
+            if prediction_correct or predictions[i] in target_list:
+                codes[i] = predictions[i]
+            else:
+                codes[i] = target_list[0]
+        else:
+            codes[i] = lookup[str(target)]
+    return codes
+
+
+def dist_array(data, columns):
+    """Return the columns as (n, len(columns)) float64 array, one row per id.
+    The values can be strings (as loaded from the TSV) or numbers."""
+    return np.column_stack([float_column(data[column])[0]
+                            for column in columns])
+
+
+def js_distances(dist, target):
+    """Jensen-Shannon distance (base 2) between every row of dist and the
+    same row of target, computed for all rows at once. Same operations as
+    scipy.spatial.distance.jensenshannon per row, so the values are
+    identical."""
+    return distance.jensenshannon(dist, target, base=2, axis=1)
+
+
+def sequential_mean(values):
+    """Mean with the sum taken in row order (np.cumsum), like the former
+    per-row loop, so the scores do not change in the last digits."""
+    if len(values) == 0:
+        return np.nan
+    return float(np.cumsum(values)[-1]) / len(values)
+
+
+def st2_distances(data, targets):
+    """Check the distributions and return the Jensen-Shannon distances of
+    every row for the binary and the multi-class distribution."""
+    check_dist(data, DIST_BIN_COLUMNS)
+    check_dist(data, DIST_MULTI_COLUMNS)
+    # one batched pass over all ids for the binary and multi-class vectors
+    score_bin = js_distances(dist_array(data, DIST_BIN_COLUMNS),
+                             dist_array(targets, DIST_BIN_COLUMNS))
+    score_multi = js_distances(dist_array(data, DIST_MULTI_COLUMNS),
+                               dist_array(targets, DIST_MULTI_COLUMNS))
+    return score_bin, score_multi
+
+
 def score_st2(data, targets):
     """Calculate the score for subtask 2"""
-    check_dist(data, ['dist_bin_0', 'dist_bin_1'])
-    check_dist(data, ['dist_multi_0', 'dist_multi_1',
-               'dist_multi_2', 'dist_multi_3', 'dist_multi_4'])
     scores = {}
-    sum_bin = 0.0
-    sum_multi = 0.0
-    for idx in range(len(data['id'])):
-        # calculate the vectors for the binary and multi-class predictions
-        dist_bin = [float(data['dist_bin_0'][idx]),
-                    float(data['dist_bin_1'][idx])]
-        dist_multi = [float(data[colname][idx]) for colname in [
-            'dist_multi_0', 'dist_multi_1', 'dist_multi_2', 'dist_multi_3',
-            'dist_multi_4']]
-        # calculate the vectors for the binary and multi-class targets
-        target_bin = [targets['dist_bin_0'][idx], targets['dist_bin_1'][idx]]
-        target_multi = [targets['dist_multi_0'][idx],
-                        targets['dist_multi_1'][idx],
-                        targets['dist_multi_2'][idx],
-                        targets['dist_multi_3'][idx],
-                        targets['dist_multi_4'][idx]]
-        # calculate the distances
-        score_bin = distance.jensenshannon(dist_bin, target_bin, base=2)
-        score_multi = distance.jensenshannon(dist_multi, target_multi, base=2)
-        sum_bin += score_bin
-        sum_multi += score_multi
-    scores['js_dist_bin'] = sum_bin / len(data['id'])
-    scores['js_dist_multi'] = sum_multi / len(data['id'])
+    score_bin, score_multi = st2_distances(data, targets)
+    scores['js_dist_bin'] = sequential_mean(score_bin)
+    scores['js_dist_multi'] = sequential_mean(score_multi)
     scores['score'] = np.mean([scores['js_dist_bin'], scores['js_dist_multi']])
     return scores
 
 
+def score_submission(submission_dir, submission_file, subtask, targets):
+    """Load one submission TSV of subtask "1" or "2" and score it against the
+    targets (list of dicts as in targets.json). Returns the scores or None
+    after logging the problem to stderr."""
+    columns = ST1_COLUMNS if subtask == "1" else ST2_COLUMNS
+    data = load_tsv(submission_dir, expected_rows=len(targets),
+                    expected_cols=columns, file=submission_file)
+    if data is None:
+        print("Problems loading the submission, aborting", file=sys.stderr)
+        return None
+
+    print(f"Loaded {len(data['id'])} rows from the submission")
+
+    # Check if the IDs in the submission match the targets
+    if set(data['id']) != {target['id'] for target in targets}:
+        print("IDs in submission do not match IDs in targets", file=sys.stderr)
+        return None
+
+    # Align the targets with the rows of the submission
+    targets_dir = align_targets(targets, data['id'], data.keys())
+    if targets_dir is None:
+        return None
+
+    # Score based on the subtask
+    if subtask == "1":
+        return score_st1(data, targets_dir)
+    return score_st2(data, targets_dir)
+
+
+def find_submissions(results_dir):
+    """All submission TSVs under results_dir, a file ending in _ST1.tsv or
+    _ST2.tsv, as sorted list of (run folder, file name, subtask)."""
+    submissions = []
+    for run_dir, _, files in os.walk(results_dir):
+        for file in files:
+            for subtask in ("1", "2"):
+                if file.endswith(f"_ST{subtask}.tsv"):
+                    submissions.append((run_dir, file, subtask))
+    return sorted(submissions)
+
+
+def init_worker(targets, debug):
+    """Keep the targets in the worker process, so they are sent once per
+    process and not once per submission."""
+    GLOBALS['targets'] = targets
+    GLOBALS['debug'] = debug
+
+
+def score_worker(submission):
+    run_dir, file, subtask = submission
+    try:
+        scores = score_submission(run_dir, file, subtask, GLOBALS['targets'])
+    except (ValueError, KeyError, IndexError) as error:
+        # one broken run (e.g. a label or id the targets don't know) only
+        # leaves its row of the leaderboard empty
+        print(f"Invalid submission {os.path.join(run_dir, file)}: {error}",
+              file=sys.stderr)
+        scores = None
+    if scores is not None:
+        with open(os.path.join(run_dir, f'scores_ST{subtask}.json'), 'w',
+                  encoding="utf-8") as score_file:
+            score_file.write(json.dumps(scores))
+    return submission, scores
+
+
+def score_batch(results_dir, targets, workers=None):
+    """Score every submission under results_dir in parallel processes and
+    write scores_ST1.json / scores_ST2.json into its run folder. Returns
+    {run folder: {subtask: scores}}, scores is None for a failed run."""
+    submissions = find_submissions(results_dir)
+    print(f"Found {len(submissions)} submissions in {results_dir}")
+    runs = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(targets, GLOBALS['debug'])) as pool:
+        results = pool.map(score_worker, submissions)
+        for (run_dir, _, subtask), scores in results:
+            run = os.path.relpath(run_dir, results_dir)
+            runs.setdefault(run, {})[subtask] = scores
+    return runs
+
+
+def write_leaderboard(runs, leaderboard_file):
+    """One row per run with the ST1 and ST2 scores, sorted by the ST1 score
+    (best first), as TSV. Missing or failed subtasks stay empty."""
+    st1_columns = [column + "_f1" for column in ST1_COLUMNS[1:]]
+    header = ['run', 'st1_score'] + st1_columns + [
+        'st2_score', 'js_dist_bin', 'js_dist_multi']
+    rows = []
+    for run, scores in runs.items():
+        st1 = scores.get("1") or {}
+        st2 = scores.get("2") or {}
+        rows.append([run, st1.get('score')]
+                    + [st1.get(column) for column in st1_columns]
+                    + [st2.get('score'), st2.get('js_dist_bin'),
+                       st2.get('js_dist_multi')])
+    rows.sort(key=lambda row: -1.0 if row[1] is None else row[1],
+              reverse=True)
+    rows = [[format_score(value) for value in row] for row in rows]
+    with open(leaderboard_file, 'w', newline='', encoding="utf-8") as outfp:
+        writer = csv.writer(outfp, delimiter='\t')
+        writer.writerow(header)
+        writer.writerows(rows)
+    print(f"Leaderboard of {len(rows)} runs written to {leaderboard_file}")
+    for row in rows:
+        print(f"{row[0]:<45} ST1 {row[1] or '-':<8} ST2 {row[-3] or '-'}")
+
+
+def format_score(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return f"{value:.4f}"
+
+
 def main():
     # Updated paths for windows systems. Exchange for different model
     submission_dir = "../../05_results/[model]"
@@ -248,17 +519,31 @@ def main():
     score_dir = "../../05_results/[model]"
 
     parser = argparse.ArgumentParser(description='Scorer for the competition')
-    parser.add_argument("--st", required=True,
+    parser.add_argument("--st",
                         choices=["1", "2"],
                         help='Subtask to evaluate, one of 1, 2')
+    parser.add_argument("--batch", metavar="RESULTS_DIR",
+                        help='Score every *_ST1.tsv and *_ST2.tsv under this '
+                        'folder (e.g. ../../05_results/result_runs) and '
+                        'write a leaderboard')
+    parser.add_argument("--leaderboard",
+                        help='Leaderboard file of --batch, default: '
+                        '[RESULTS_DIR]/leaderboard.tsv')
+    parser.add_argument("--workers", type=int,
+                        help='Processes of --batch, default: number of CPUs')
     parser.add_argument(
         "--debug", help='Print debug information', action='store_true')
     args = parser.parse_args()
+    if args.st is None and args.batch is None:
+        parser.error("one of --st or --batch is required")
 
     GLOBALS['debug'] = args.debug
-    print(f'Running scorer for subtask {args.st}')
+    if args.batch is not None:
+        print(f'Running scorer for all submissions in {args.batch}')
+    else:
+        print(f'Running scorer for subtask {args.st}')
 
-    print("Running locally with hardcoded paths")
+        print("Running locally with hardcoded paths")
 
     targets_file = os.path.join(reference_dir, "targets.json")
     print(f"Using targets file {targets_file}")
@@ -267,56 +552,17 @@ def main():
     targets = load_targets(targets_file)
     print(f"Loaded {len(targets)} targets")
 
-    # Index the targets for easy lookup
-    targets_index = {t['id']: t for t in targets}
-
-    # Load the submission TSV file based on subtask
-    if args.st == "1":
-        data = load_tsv(submission_dir, expected_rows=len(
-            targets), expected_cols=ST1_COLUMNS, file=submission_file)
-    elif args.st == "2":
-        data = load_tsv(submission_dir, expected_rows=len(
-            targets), expected_cols=ST2_COLUMNS, file=submission_file)
-    else:
-        print("Unknown subtask", file=sys.stderr)
-        sys.exit(1)
-
-    if data is None:
-        print("Problems loading the submission, aborting", file=sys.stderr)
-        sys.exit(1)
-
-    print(f"Loaded {len(data['id'])} rows from the submission")
-
-    # Check if the IDs in the submission match the targets
-    if set(data['id']) != set(targets_index.keys()):
-        print("IDs in submission do not match IDs in targets", file=sys.stderr)
-        sys.exit(1)
-
-    # Convert targets to the same format as the submission
-    targets_dir = {}
-    for col_name in data.keys():
-        if col_name == 'id':
-            continue
-        col_values = []
-        for idx, id in enumerate(data['id']):
-            if id not in targets_index:
-                print(f"ID {id} not found in targets for id {
-                      id} in row {idx}", file=sys.stderr)
-                sys.exit(1)
-            if col_name not in targets_index[id]:
-                print(f"Column {col_name} not found in targets for id {
-                      id} in row {idx}", file=sys.stderr)
-                sys.exit(1)
-            col_values.append(targets_index[id][col_name])
-        targets_dir[col_name] = col_values
-
-    # Score based on the subtask
-    if args.st == "1":
-        scores = score_st1(data, targets_dir)
-    elif args.st == "2":
-        scores = score_st2(data, targets_dir)
-    else:
-        print("Unknown subtask", file=sys.stderr)
+    if args.batch is not None:
+        runs = score_batch(args.batch, targets, args.workers)
+        leaderboard_file = args.leaderboard or os.path.join(
+            args.batch, 'leaderboard.tsv')
+        write_leaderboard(runs, leaderboard_file)
+        print("Ending scorer")
+        return
+
+    scores = score_submission(submission_dir, submission_file, args.st,
+                              targets)
+    if scores is None:
         sys.exit(1)
 
     print("Scores:", scores)
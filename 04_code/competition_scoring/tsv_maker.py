@@ -0,0 +1,109 @@
+# This script transforms the predictions into the format needed for the
+# competition, subtask 1 and subtask 2 (.tsv files) at once: result.jsonl is
+# read once, line by line, and every text is written to both files right
+# away, so the corpus is never held in memory. Same values as
+# ST_1_tsv_maker.py and ST_2_tsv_maker.py.
+# Start: python tsv_maker.py --input ../../03_input/[model]/result.jsonl
+
+# Date: October 17, 2026
+
+# import libraries
+import argparse
+import csv
+import os
+import sys
+from scoring import MULT_LABELS, ST1_COLUMNS, ST2_COLUMNS
+
+# corpus_store.py (converted .corpus folders) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from corpus_store import read_records  # noqa: E402
+
+LABEL_CODES = {label: code for code, label in enumerate(MULT_LABELS)}
+
+
+# count the labels of one text: counts per label code and the code of the
+# label that comes first, needed for the majority like Counter.most_common
+def label_counts(annotations):
+    counts = [0] * len(MULT_LABELS)
+    first_seen = []
+    for annotation in annotations:
+        code = LABEL_CODES[annotation['label']]
+        if counts[code] == 0:
+            first_seen.append(code)
+        counts[code] += 1
+    return counts, first_seen
+
+
+# the subtask 1 columns of one text from its label counts, on equal counts
+# the label seen first is the majority
+def st1_values(counts, first_seen):
+    majority = max(first_seen, key=lambda code: counts[code])
+    labelled = sum(counts[1:])
+    return {
+        "bin_maj": 1 if majority != 0 else 0,
+        "bin_one": 1 if labelled > 0 else 0,
+        "bin_all": 1 if counts[0] == 0 else 0,
+        "multi_maj": MULT_LABELS[majority],
+        "disagree_bin": 1 if labelled > 0 and counts[0] > 0 else 0
+    }
+
+
+# the subtask 2 distributions of one text from its label counts
+def st2_values(counts):
+    total = sum(counts)
+    values = {"dist_bin_0": counts[0] / total,
+              "dist_bin_1": sum(counts[1:]) / total}
+    for code, count in enumerate(counts):
+        values[f"dist_multi_{code}"] = count / total
+    return values
+
+
+# label counts of every text of a result.jsonl (or .corpus folder), one
+# after the other
+def read_counts(input_file):
+    for record in read_records(input_file):
+        yield record['id'], label_counts(record['annotations'])
+
+
+# write both TSV files in one pass over the predictions
+def convert(input_file, st1_file, st2_file):
+    with open(st1_file, 'w', newline='', encoding='utf-8') as st1, \
+            open(st2_file, 'w', newline='', encoding='utf-8') as st2:
+        # line endings like the old scripts: csv default (\r\n) for ST1,
+        # \n like pandas for ST2
+        st1_writer = csv.DictWriter(st1, delimiter='\t',
+                                    fieldnames=ST1_COLUMNS)
+        st2_writer = csv.DictWriter(st2, delimiter='\t',
+                                    fieldnames=ST2_COLUMNS,
+                                    lineterminator='\n')
+        st1_writer.writeheader()
+        st2_writer.writeheader()
+        rows = 0
+        for id_, (counts, first_seen) in read_counts(input_file):
+            st1_writer.writerow({"id": id_, **st1_values(counts, first_seen)})
+            st2_writer.writerow({"id": id_, **st2_values(counts)})
+            rows += 1
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Write the subtask 1 and 2 TSV files of a result.jsonl')
+    parser.add_argument("--input", required=True,
+                        help='result.jsonl with the predictions')
+    parser.add_argument("--st1", help='default: results_st1.tsv next to '
+                        'the input')
+    parser.add_argument("--st2", help='default: results_st2.tsv next to '
+                        'the input')
+    args = parser.parse_args()
+    folder = os.path.dirname(args.input)
+    st1_file = args.st1 or os.path.join(folder, "results_st1.tsv")
+    st2_file = args.st2 or os.path.join(folder, "results_st2.tsv")
+    rows = convert(args.input, st1_file, st2_file)
+    print(f"Transformation (ST1 and ST2) of {rows} texts complete for file "
+          f"{args.input}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# This script reads a corpus (.jsonl) once into compact arrays: the text
+# length of every entry and the annotator and label code of every
+# annotation, with the offsets of the annotations of each entry. The
+# statistics of data_analysis.py are computed from these arrays, so a file
+# is parsed only once and several files can be profiled in one process.
+# A converted corpus (helper/corpus_store.py) is loaded without parsing.
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+import sys
+import numpy as np
+
+# corpus_store.py (converted .corpus folders) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from corpus_store import Corpus, is_corpus  # noqa: E402
+
+# order of the labels, the code of a label is its index
+label_order = ["0-Kein", "1-Gering", "2-Vorhanden", "3-Stark", "4-Extrem"]
+
+
+# arrays of one corpus file
+class CorpusProfile:
+    def __init__(self, file_path, text_lengths, offsets, annotators,
+                 annotator_codes, label_codes):
+        self.file_path = file_path
+        # per entry
+        self.text_lengths = text_lengths
+        # annotations of entry i: offsets[i] to offsets[i + 1]
+        self.offsets = offsets
+        # annotator names in the order of their first annotation
+        self.annotators = annotators
+        # per annotation
+        self.annotator_codes = annotator_codes
+        self.label_codes = label_codes
+
+    # number of annotators (annotations) of every entry
+    def annotators_per_text(self):
+        return np.diff(self.offsets)
+
+    # label counts as (annotators, labels) matrix
+    def label_counts(self):
+        counts = np.zeros((len(self.annotators), len(label_order)),
+                          dtype=np.int64)
+        np.add.at(counts, (self.annotator_codes, self.label_codes), 1)
+        return counts
+
+    # label codes of the annotations of one annotator
+    def scores(self, annotator):
+        code = self.annotators.index(annotator)
+        return self.label_codes[self.annotator_codes == code]
+
+    # one row per annotation with the annotator name and the label, the
+    # format of the plotting functions
+    def annotation_table(self):
+        return {'user': np.array(self.annotators)[self.annotator_codes],
+                'label': np.array(label_order)[self.label_codes]}
+
+
+# profile of a .corpus folder. Annotations without label (label code -1,
+# corpus of annotators only) are left out and the annotators are numbered in
+# the order of their first labelled annotation, like for the .jsonl file
+def corpus_profile(file_path):
+    corpus = Corpus(file_path)
+    labelled = np.asarray(corpus.label_codes) >= 0
+    entries = corpus.annotation_entries()[labelled]
+    offsets = np.zeros(len(corpus) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(entries, minlength=len(corpus)), out=offsets[1:])
+    codes = np.asarray(corpus.annotator_codes)[labelled]
+    used, first = np.unique(codes, return_index=True)
+    used = used[np.argsort(first)]
+    recode = np.full(len(corpus.annotator_names), -1, dtype=np.int16)
+    recode[used] = np.arange(len(used))
+    return CorpusProfile(file_path, np.asarray(corpus.text_lengths), offsets,
+                         [corpus.annotator_names[code]
+                          for code in used.tolist()],
+                         recode[codes],
+                         np.asarray(corpus.label_codes)[labelled])
+
+
+# parse the corpus once, a .corpus folder already has the arrays
+def profile_corpus(file_path):
+    if is_corpus(file_path):
+        return corpus_profile(file_path)
+    label_index = {label: code for code, label in enumerate(label_order)}
+    annotator_index = {}
+    text_lengths = []
+    offsets = [0]
+    annotator_codes = []
+    label_codes = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            entry = json.loads(line.strip())
+            text_lengths.append(len(entry['text']))
+            for annotation in entry.get('annotations', []):
+                user = annotation['user']
+                if user not in annotator_index:
+                    annotator_index[user] = len(annotator_index)
+                annotator_codes.append(annotator_index[user])
+                label_codes.append(label_index[annotation['label']])
+            offsets.append(len(label_codes))
+    return CorpusProfile(file_path,
+                         np.array(text_lengths, dtype=np.int32),
+                         np.array(offsets, dtype=np.int64),
+                         list(annotator_index),
+                         np.array(annotator_codes, dtype=np.int16),
+                         np.array(label_codes, dtype=np.int8))
@@ -4,49 +4,28 @@
 # Date: September 05, 2024
 
 # import libraries
-import json
 import nltk
 import sys
+import numpy as np
 import pandas as pd
 import seaborn as sns
-from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from nltk.corpus import stopwords
-from collections import defaultdict
-from collections import Counter
+from corpus_profile import label_order, profile_corpus
+from wordcloud_generate import count_label_words, render_wordclouds
 nltk.download('stopwords')
 
-# dictionaries and lists to store data
-text_lengths = []
-annotator_counts = []
-annotator_scores = {}
-annotation_counts = {}
-
-# transform labels into numeric values
-label_mapping = {
-    "0-Kein": 0,
-    "1-Gering": 1,
-    "2-Vorhanden": 2,
-    "3-Stark": 3,
-    "4-Extrem": 4
-}
-
-
-# basic analysis for the jsonl file: Text length (max, min, average)
-def basic_analysis(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            entry = json.loads(line.strip())
-            text = entry['text']
-            text_length = len(text)
-            text_lengths.append(text_length)
-
-    max_length = max(text_lengths)
-    min_length = min(text_lengths)
-    average_length = sum(text_lengths) / len(text_lengths)
-    median_length = sorted(text_lengths)[len(text_lengths) // 2]
-
-    print(f"Text analysis for {file_path}")
+
+# basic analysis for the profiled jsonl file: Text length (max, min, average)
+def basic_analysis(profile):
+    text_lengths = profile.text_lengths
+
+    max_length = int(text_lengths.max())
+    min_length = int(text_lengths.min())
+    average_length = int(text_lengths.sum()) / len(text_lengths)
+    median_length = int(np.sort(text_lengths)[len(text_lengths) // 2])
+
+    print(f"Text analysis for {profile.file_path}")
     print(f"Maximum length: {max_length}")
     print(f"Minimum length: {min_length}")
     print(f"Average length: {average_length}")
@@ -54,19 +33,14 @@ def basic_analysis(file_path):
 
 
 # analysis the amount of annotators per text unit
-def annotator_analysis(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            entry = json.loads(line.strip())
-            annotations = entry['annotations']
-            annotator_count = len(annotations)
-            annotator_counts.append(annotator_count)
-
-    max_annotators = max(annotator_counts)
-    min_annotators = min(annotator_counts)
-    average_annotators = sum(annotator_counts) / len(annotator_counts)
-
-    print(f"Annotator analysis for {file_path}")
+def annotator_analysis(profile):
+    annotator_counts = profile.annotators_per_text()
+
+    max_annotators = int(annotator_counts.max())
+    min_annotators = int(annotator_counts.min())
+    average_annotators = int(annotator_counts.sum()) / len(annotator_counts)
+
+    print(f"Annotator analysis for {profile.file_path}")
     print(f"Maximum number of annotators: {max_annotators}")
     print(f"Minimum number of annotators: {min_annotators}")
     print(f"Average number of annotators: {average_annotators}")
@@ -74,133 +48,66 @@ def annotator_analysis(file_path):
 
 # analysis the scores given by the different annotators per set.
 # Amount of annotations, average rating, max and min rating
-def annotator_score_analysis(file_path):
-    # Read the JSONL file and process each line
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            entry = json.loads(line.strip())
-            annotations = entry['annotations']
-            for annotation in annotations:
-                user = annotation['user']
-                label = annotation['label']
-                score = label_mapping[label]
-                if user not in annotator_scores:
-                    annotator_scores[user] = []
-                    annotation_counts[user] = 0
-                annotator_scores[user].append(score)
-                annotation_counts[user] += 1
-
-    print(f"Annotator score analysis for {file_path}")
-    for user, scores in annotator_scores.items():
-        max_score = max(scores)
-        min_score = min(scores)
-        average_score = sum(scores) / len(scores)
-        num_annotations = annotation_counts[user]
-
-        sorted_numbers = sorted(scores)
+def annotator_score_analysis(profile):
+    print(f"Annotator score analysis for {profile.file_path}")
+    for user in profile.annotators:
+        sorted_numbers = np.sort(profile.scores(user)).tolist()
         n = len(sorted_numbers)
+        max_score = sorted_numbers[-1]
+        min_score = sorted_numbers[0]
+        average_score = sum(sorted_numbers) / n
         if n % 2 == 1:
             median = sorted_numbers[n // 2]
         else:
             median = (sorted_numbers[n // 2 - 1] + sorted_numbers[n // 2]) / 2
 
         print(f"Annotator {user}:")
-        print(f"  Number of annotations: {num_annotations}")
+        print(f"  Number of annotations: {n}")
         print(f"  Maximum score: {max_score}")
         print(f"  Minimum score: {min_score}")
         print(f"  Average score: {average_score}")
         print(f"  Median score: {median}")
 
 
-# generate a wordcloud for the different sets split by labels
+# generate a wordcloud for the different sets split by labels, a text counts
+# once for every annotation with the label
 def generate_wordcloud(file_path):
-    text_data_by_label = defaultdict(str)
-
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            entry = json.loads(line.strip())
-            text = entry['text']
-            labels = [annotation['label']
-                      for annotation in entry['annotations']]
-            for label in labels:
-                text_data_by_label[label] += " " + text
-
     german_stopwords = set(stopwords.words('german'))
+    word_counts = count_label_words(file_path, german_stopwords,
+                                    unique_texts=False)
 
     # Generate the word cloud for each label
-    for label, text_data in text_data_by_label.items():
-        wordcloud = WordCloud(width=800, height=400, max_words=600,
-                              background_color='white',
-                              stopwords=german_stopwords).generate(text_data)
-
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-
-        output_path_svg = f'../../05_results/visuals/{label}.svg'
-        plt.savefig(output_path_svg, format='svg')
-
-        output_path_png = f'../../05_results/visuals/{label}.png'
-        plt.savefig(output_path_png, format='png')
-        plt.close()
+    render_wordclouds([(dict(counts), None,
+                        f'../../05_results/visuals/{label}', 600)
+                       for label, counts in word_counts.items()])
 
 
 # calculates labels per annotator
-def count_labels_per_annotator(file_path):
-    label_counts = defaultdict(lambda: defaultdict(int))
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            entry = json.loads(line)
-            annotations = entry.get('annotations', [])
-            for annotation in annotations:
-                annotator = annotation['user']
-                label = annotation['label']
-                label_counts[annotator][label] += 1
-
-    for annotator, counts in label_counts.items():
+def count_labels_per_annotator(profile):
+    label_counts = profile.label_counts()
+
+    for annotator, counts in zip(profile.annotators, label_counts):
         print(f'Annotator {annotator}:')
-        for label, count in counts.items():
-            print(f'  {label}: {count}')
+        for label, count in zip(label_order, counts):
+            if count > 0:
+                print(f'  {label}: {count}')
 
 
 # counts the amount of labels (plus total labels)
-def count_label_appearances(file_path):
-    label_counts = Counter()
+def count_label_appearances(profile):
+    label_counts = np.bincount(profile.label_codes,
+                               minlength=len(label_order))
 
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            data = json.loads(line.strip())
-            for annotation in data.get('annotations', []):
-                label = annotation.get('label')
-                if label:
-                    label_counts[label] += 1
-
-    for label, count in label_counts.items():
-        print(f"{label}: {count}")
-    total = 0
-    for label, count in label_counts.items():
-        total += int(count)
-    print(f"Total: {total}")
+    for label, count in zip(label_order, label_counts):
+        if count > 0:
+            print(f"{label}: {count}")
+    print(f"Total: {int(label_counts.sum())}")
 
 
 # generate figures for the distribution of labels per annotator with displaying
 # the mean of each annotator
-def generate_annotator_distribution(file_path, name):
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            data.append(json.loads(line))
-    annotator_data = []
-
-    for entry in data:
-        for annotation in entry['annotations']:
-            annotator_data.append({
-                'user': annotation['user'],
-                'label': annotation['label']
-            })
-
-    df = pd.DataFrame(annotator_data)
+def generate_annotator_distribution(profile, name):
+    df = pd.DataFrame(profile.annotation_table())
 
     # Convert labels to numeric values
     df['numeric_label'] = df['label'].str.extract(r'(\d+)').astype(int)
@@ -235,22 +142,8 @@ def generate_annotator_distribution(file_path, name):
 
 
 #  makes a figure that displays the labels (amount) per annotator in a barplot
-def generate_label_graph(file_path, name):
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            data.append(json.loads(line))
-
-    annotator_data = []
-
-    for entry in data:
-        for annotation in entry['annotations']:
-            annotator_data.append({
-                'user': annotation['user'],
-                'label': annotation['label']
-            })
-
-    df = pd.DataFrame(annotator_data)
+def generate_label_graph(profile, name):
+    df = pd.DataFrame(profile.annotation_table())
 
     # Count the number of each label per annotator
     label_counts = df.pivot_table(
@@ -293,16 +186,19 @@ def main():
     # change the name for the different corpus splits
     trainset = "../../01_data/[name].jsonl"
     output_name = "trainset"
-    # comment/uncomment the different methods to analyze the corpus
+    # comment/uncomment the different methods to analyze the corpus, each
+    # file is read once by profile_corpus
+    train_profile = profile_corpus(trainset)
     # testset = "../../01_data/[name].jsonl"
-    # basic_analysis(testset)
-    # annotator_analysis(testset)
-    # annotator_score_analysis(testset)
+    # test_profile = profile_corpus(testset)
+    # basic_analysis(test_profile)
+    # annotator_analysis(test_profile)
+    # annotator_score_analysis(test_profile)
     # generate_wordcloud(testset)
-    # count_labels_per_annotator(trainset)
-    # count_label_appearances(trainset)
-    # generate_annotator_distribution(trainset, name)
-    generate_label_graph(trainset, output_name)
+    # count_labels_per_annotator(train_profile)
+    # count_label_appearances(train_profile)
+    # generate_annotator_distribution(train_profile, output_name)
+    generate_label_graph(train_profile, output_name)
 
 
 if __name__ == '__main__':
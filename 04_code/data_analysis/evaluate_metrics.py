@@ -10,9 +10,18 @@
 
 # import libraries
 import sys
+import csv
 import json
+import os
 import numpy as np
 
+# corpus_store.py (converted .corpus folders) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from corpus_store import read_records  # noqa: E402
+
+MULT_LABELS = ["0-Kein", "1-Gering", "2-Vorhanden", "3-Stark", "4-Extrem"]
+
 
 # calculate precision
 def precision(tp, fp):
@@ -43,62 +52,193 @@ def accuracy(tp, fp, fn):
     return acc.astype(float)
 
 
-# compare the gold labels with the prediction labels
+# compare the gold labels with the prediction labels: the ids are joined by
+# key and the (id, user, label) triples of all joined ids are compared at once
 def compareValues(corpus_dict, prediction_dict, output_file):
-    tp_total = 0
-    fp_total = 0
-    fn_total = 0
-    for key_corpus in corpus_dict:
-        for key_prediction in prediction_dict:
-            if key_corpus == key_prediction:
-                tp, fp, fn = comparePrediction(
-                    corpus_dict[key_corpus], prediction_dict[key_corpus])
-
-                tp_total = tp_total + tp
-                fp_total = fp_total + fp
-                fn_total = fn_total + fn
-                # print(corpus_dict[key_corpus])
+    ids, only_corpus, only_prediction = joinIds(corpus_dict, prediction_dict)
+    reportUnmatched(only_corpus, "gold")
+    reportUnmatched(only_prediction, "prediction")
+    corpus_triples = makeTriples(corpus_dict, ids)
+    prediction_triples = makeTriples(prediction_dict, ids)
+    tp_total = len(corpus_triples & prediction_triples)
+    fp_total = len(prediction_triples - corpus_triples)
+    fn_total = len(corpus_triples - prediction_triples)
+    # an entry without annotations in gold and prediction is correct
+    tp_total += sum(1 for id_ in ids
+                    if not corpus_dict[id_] and not prediction_dict[id_])
     print(tp_total, fp_total, fn_total)
     saveData(tp_total, fp_total, fn_total, prediction_dict, output_file)
+    breakdown = labelBreakdown(corpus_dict, prediction_dict, ids)
+    saveBreakdown(breakdown, output_file)
+
+
+# ids in both dicts, only in the gold dict, only in the prediction dict
+def joinIds(corpus_dict, prediction_dict):
+    corpus_ids = corpus_dict.keys()
+    prediction_ids = prediction_dict.keys()
+    return (corpus_ids & prediction_ids, corpus_ids - prediction_ids,
+            prediction_ids - corpus_ids)
+
+
+# print how many ids are only on one side and some of them
+def reportUnmatched(ids, side, shown=5):
+    if ids:
+        examples = ", ".join(sorted(ids)[:shown])
+        print(f"{len(ids)} ids only in the {side} file, e.g. {examples}")
+
+
+# set of the (id, user, label) triples of the given ids
+def makeTriples(annotation_dict, ids):
+    return {(id_, item['user'], item['label'])
+            for id_ in ids for item in annotation_dict[id_]}
+
+
+# labels of every (id, user) pair of the given ids, like the triples a
+# repeated label counts once
+def makeLabelSets(annotation_dict, ids):
+    labels = {}
+    for id_ in ids:
+        for item in annotation_dict[id_]:
+            labels.setdefault((id_, item['user']), set()).add(item['label'])
+    return labels
 
 
-# compare one entry; saved in a set to compare, return the fp, tp and fn
-def comparePrediction(corpus_items, prediction_items):
-    corpus_set = set()
-    prediction_set = set()
-    for item_corpus in corpus_items:
-        user = item_corpus['user']
-        label = item_corpus['label']
-        corpus_set.update([(user, label)])
-    for item_prediction in prediction_items:
-        user = item_prediction['user']
-        label = item_prediction['label']
-        prediction_set.update([(user, label)])
-    # print(corpus_set)
-    # print(prediction_set)
-    tp = len(corpus_set.intersection(prediction_set))
-    fp = len(prediction_set.difference(corpus_set))
-    fn = len(corpus_set.difference(prediction_set))
-
-    if len(corpus_set) == 0 and len(prediction_set) == 0:
-        tp += 1
-
-    # print(tp, fp, fn)
-    return tp, fp, fn
-
-
-# transform the jsonl file into a dict with the id as key and all annotations
-# with name and label as value
+# one pass over the (id, user) pairs of the joined ids into arrays per
+# annotator, counted like the triples of compareValues so the totals are the
+# same: a label in gold and prediction is a tp on the diagonal of confusion
+# (gold label x predicted label over MULT_LABELS). The remaining gold and
+# predicted labels of a pair are matched in label order (off the diagonal),
+# the rest is missing (gold label without prediction, fn) or extra
+# (predicted label without gold label, fp). invalid are predicted labels not
+# in MULT_LABELS (fp), empty the ids without annotations in gold and
+# prediction (tp of no annotator and label).
+def labelBreakdown(corpus_dict, prediction_dict, ids):
+    gold = makeLabelSets(corpus_dict, ids)
+    predicted = makeLabelSets(prediction_dict, ids)
+    users = sorted({user for _, user in gold.keys() | predicted.keys()})
+    user_index = {user: i for i, user in enumerate(users)}
+    label_index = {label: i for i, label in enumerate(MULT_LABELS)}
+    k = len(MULT_LABELS)
+    confusion = np.zeros((len(users), k, k), dtype=np.int64)
+    missing = np.zeros((len(users), k), dtype=np.int64)
+    extra = np.zeros((len(users), k), dtype=np.int64)
+    invalid = np.zeros(len(users), dtype=np.int64)
+    for pair in gold.keys() | predicted.keys():
+        user = user_index[pair[1]]
+        gold_labels = gold.get(pair, set())
+        predicted_labels = predicted.get(pair, set())
+        for label in gold_labels & predicted_labels:
+            confusion[user, label_index[label], label_index[label]] += 1
+        gold_rest = sorted(label_index[label]
+                           for label in gold_labels - predicted_labels)
+        predicted_rest = predicted_labels - gold_labels
+        valid_rest = sorted(label_index[label] for label in predicted_rest
+                            if label in label_index)
+        invalid[user] += len(predicted_rest) - len(valid_rest)
+        for gold_code, predicted_code in zip(gold_rest, valid_rest):
+            confusion[user, gold_code, predicted_code] += 1
+        for gold_code in gold_rest[len(valid_rest):]:
+            missing[user, gold_code] += 1
+        for predicted_code in valid_rest[len(gold_rest):]:
+            extra[user, predicted_code] += 1
+    empty = sum(1 for id_ in ids
+                if not corpus_dict[id_] and not prediction_dict[id_])
+    return {"annotators": users, "labels": MULT_LABELS,
+            "confusion": confusion, "missing": missing, "extra": extra,
+            "invalid": invalid, "empty": empty}
+
+
+# per label tp, fp, fn, precision, recall and f1 of one confusion matrix
+# (missing gold labels count as fn, extra predictions as fp), plus macro
+# (mean over the labels that occur) and micro aggregates. The micro counts
+# also contain the invalid labels (fp) and the empty ids (tp), so the micro
+# of all annotators is the micro-f1 of [method].txt
+def labelMetrics(confusion, missing, extra, invalid=0, empty=0):
+    tp = np.diagonal(confusion)
+    fp = confusion.sum(axis=0) - tp + extra
+    fn = confusion.sum(axis=1) - tp + missing
+    metrics = {"support": confusion.sum(axis=1) + missing, "tp": tp,
+               "fp": fp, "fn": fn}
+    metrics.update(rates(tp, fp, fn))
+    occurring = (tp + fp + fn) > 0
+    macro = {name: float(metrics[name][occurring].mean())
+             if occurring.any() else 0.0
+             for name in ("precision", "recall", "f1")}
+    counts = {"tp": int(tp.sum()) + int(empty),
+              "fp": int(fp.sum()) + int(invalid), "fn": int(fn.sum())}
+    micro = {name: float(value) for name, value in
+             rates(counts["tp"], counts["fp"], counts["fn"]).items()}
+    micro.update(counts)
+    return metrics, macro, micro
+
+
+# precision, recall and f1 (0 where not defined) of counts or count arrays
+def rates(tp, fp, fn):
+    tp, fp, fn = (np.asarray(value, dtype=float) for value in (tp, fp, fn))
+    zeros = np.zeros_like(tp)
+    pre = np.divide(tp, tp + fp, out=zeros.copy(), where=(tp + fp) > 0)
+    rec = np.divide(tp, tp + fn, out=zeros.copy(), where=(tp + fn) > 0)
+    f1 = np.divide(2 * pre * rec, pre + rec, out=zeros.copy(),
+                   where=(pre + rec) > 0)
+    return {"precision": pre, "recall": rec, "f1": f1}
+
+
+# save the breakdown per annotator and label as json (arrays as lists) and
+# csv (one row per annotator and label, "all" are all annotators together)
+def saveBreakdown(breakdown, output_file):
+    name = os.path.splitext(output_file)[0]
+    groups = [(user, breakdown["confusion"][i], breakdown["missing"][i],
+               breakdown["extra"][i], breakdown["invalid"][i], 0)
+              for i, user in enumerate(breakdown["annotators"])]
+    groups.append(("all", breakdown["confusion"].sum(axis=0),
+                   breakdown["missing"].sum(axis=0),
+                   breakdown["extra"].sum(axis=0),
+                   breakdown["invalid"].sum(), breakdown["empty"]))
+    result = {"labels": breakdown["labels"],
+              "annotators": breakdown["annotators"],
+              "invalid": dict(zip(breakdown["annotators"],
+                                  breakdown["invalid"].tolist())),
+              "empty": breakdown["empty"],
+              "metrics": {}}
+    rows = []
+    for user, confusion, missing, extra, invalid, empty in groups:
+        metrics, macro, micro = labelMetrics(confusion, missing, extra,
+                                             invalid, empty)
+        result["metrics"][user] = {
+            "confusion": confusion.tolist(), "missing": missing.tolist(),
+            "extra": extra.tolist(),
+            "per_label": {name: values.tolist()
+                          for name, values in metrics.items()},
+            "macro": macro, "micro": micro}
+        for i, label in enumerate(breakdown["labels"]):
+            rows.append([user, label] + [metrics[name][i] for name in
+                                         ("support", "tp", "fp", "fn",
+                                          "precision", "recall", "f1")])
+        rows.append([user, "macro", "", "", "", "", macro["precision"],
+                     macro["recall"], macro["f1"]])
+        rows.append([user, "micro", "", micro["tp"], micro["fp"],
+                     micro["fn"], micro["precision"], micro["recall"],
+                     micro["f1"]])
+    with open(f"../../05_results/{name}_breakdown.json", "w",
+              encoding="utf-8") as file:
+        json.dump(result, file, indent=2)
+    with open(f"../../05_results/{name}_breakdown.csv", "w", newline="",
+              encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["annotator", "label", "support", "tp", "fp", "fn",
+                         "precision", "recall", "f1"])
+        writer.writerows(rows)
+
+
+# transform the jsonl file (or .corpus folder) into a dict with the id as key
+# and all annotations with name and label as value
 def make_dict(file_path):
     result_dict = {}
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            json_obj = json.loads(line.strip())
-
-            id_ = json_obj['id']
-            annotations = json_obj['annotations']
+    for json_obj in read_records(file_path):
+        id_ = json_obj['id']
+        annotations = json_obj['annotations']
 
-            result_dict[id_] = annotations
+        result_dict[id_] = annotations
     return result_dict
 
 
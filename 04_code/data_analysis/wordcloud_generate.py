@@ -3,85 +3,138 @@
 # Author: Niklas Donhauser
 # Date: September 05, 2024
 
+# Every text is tokenized once into word counts, the counts are summed per
+# label and the wordclouds are drawn from these frequencies
+# (WordCloud.generate_from_frequencies) in parallel processes, for all labels
+# of all files in one run.
+# Start: python wordcloud_generate.py --files competition_train.jsonl
+#            competition_test.jsonl --setnames Trainset Testset
+
 # import libraries
-import json
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from nltk.corpus import stopwords
-from collections import defaultdict, Counter
+import argparse
 import os
 import sys
+from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+import matplotlib.pyplot as plt
+from wordcloud import WordCloud
+from nltk.corpus import stopwords
 # import nltk
 # nltk.download('stopwords')
 
-
-# generate the wordcloud for every label a new wordcloud
-def generate_wordcloud(file_name, setname):
+# corpus_store.py (converted .corpus folders) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from corpus_store import read_records  # noqa: E402
+
+
+# the wordclouds are only saved, the processes need no window (the backend
+# of the importing script stays unchanged)
+def init_worker():
+    matplotlib.use("Agg")
+
+
+# lower case words without stopwords, only letters
+def tokenize(text, german_stopwords):
+    return Counter(word for word in (token.lower() for token in text.split())
+                   if word not in german_stopwords and word.isalpha())
+
+
+# word counts per label, every distinct text is tokenized once. With
+# unique_texts a text counts once per label (like the set of texts before),
+# otherwise once per annotation with that label.
+def count_label_words(file_path, german_stopwords, unique_texts=True):
+    tokens = {}
+    texts_by_label = defaultdict(set)
+    word_counts = defaultdict(Counter)
+    for entry in read_records(file_path):
+        text = entry['text']
+        if text not in tokens:
+            tokens[text] = tokenize(text, german_stopwords)
+        for annotation in entry['annotations']:
+            label = annotation['label']
+            if unique_texts:
+                if text in texts_by_label[label]:
+                    continue
+                texts_by_label[label].add(text)
+            word_counts[label].update(tokens[text])
+    return word_counts
+
+
+# draw one wordcloud and save it as svg and png, runs in a process
+def render_wordcloud(task):
+    frequencies, caption, output_base, max_words = task
+    wordcloud = WordCloud(width=800, height=400, max_words=max_words,
+                          background_color='white'
+                          ).generate_from_frequencies(frequencies)
+
+    # Display the word cloud
+    plt.figure(figsize=(10, 5))
+    plt.imshow(wordcloud, interpolation='bilinear')
+    plt.axis('off')
+
+    if caption:
+        plt.figtext(0.5, 0.01, caption, ha="center", fontsize=24)
+
+    plt.savefig(f'{output_base}.svg', format='svg')
+    plt.savefig(f'{output_base}.png', format='png')
+    plt.close()
+    return output_base
+
+
+# draw all wordclouds in a process pool
+def render_wordclouds(tasks, workers=None):
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=init_worker) as pool:
+        for output_base in pool.map(render_wordcloud, tasks):
+            print(f"Saved {output_base}")
+
+
+# count the words of every label and print the most common ones; returns
+# the drawing tasks of the labels
+def wordcloud_tasks(file_name, setname, german_stopwords):
     file_path = os.path.join('../../01_data', file_name)
-    text_data_by_label = defaultdict(set)
-
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            entry = json.loads(line.strip())
-            text = entry['text']
-            labels = [annotation['label']
-                      for annotation in entry['annotations']]
-            for label in labels:
-                text_data_by_label[label].add(text)
-
-    text_data_by_label = {label: " ".join(
-        texts) for label, texts in text_data_by_label.items()}
-
-    print(text_data_by_label["0-Kein"])
-    german_stopwords = set(stopwords.words('german'))
-    for label, text_data in text_data_by_label.items():
-        # Tokenize the text and remove stopwords
-        words = [
-            word.lower() for word in text_data.split()
-            if word.lower() not in german_stopwords and word.isalpha()
-        ]
-
-        # Count word frequencies
-        word_counter = Counter(words)
+    word_counts = count_label_words(file_path, german_stopwords)
 
+    tasks = []
+    for label, word_counter in word_counts.items():
         most_common_words = word_counter.most_common(80)
 
         print(f"Top 10 words for label '{label}':")
         for word, count in most_common_words:
             print(f"{word}: {count}")
         print("\n" + "-"*40 + "\n")
-    # Generate the word cloud for each label
-    for label, text_data in text_data_by_label.items():
-        wordcloud = WordCloud(width=800, height=400, max_words=200,
-                              background_color='white',
-                              stopwords=german_stopwords).generate(text_data)
-
-        # Display the word cloud
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-
-        plt.figtext(0.5, 0.01, f"Most common words for the label: {label} ({setname})",  # noqa: E501
-                    ha="center", fontsize=24)
-
-        print(file)
-        short_file_name = file_name[:-6]
-        name = short_file_name + "_" + label
-
-        output_path_svg = f'../../05_results/visuals/{name}.svg'
-        plt.savefig(output_path_svg, format='svg')
 
-        output_path_png = f'../../05_results/visuals/{name}.png'
-        plt.savefig(output_path_png, format='png')
-        plt.close()
+        short_file_name = os.path.splitext(file_name)[0]
+        name = short_file_name + "_" + label
+        tasks.append((dict(word_counter),
+                      f"Most common words for the label: {label} "
+                      f"({setname})",
+                      f'../../05_results/visuals/{name}', 200))
+    return tasks
 
 
 def main():
-    # exchange setname
-    files = ["competition_test.jsonl"]
-    setname = "rainset"
-    for file in files:
-        generate_wordcloud(file, setname)
+    parser = argparse.ArgumentParser(
+        description='Wordclouds per label of corpus files in 01_data')
+    parser.add_argument("--files", nargs="+",
+                        default=["competition_test.jsonl"])
+    parser.add_argument("--setnames", nargs="+",
+                        help='Name of every file in the caption, default: '
+                        'Trainset')
+    parser.add_argument("--workers", type=int,
+                        help='Processes, default: number of CPUs')
+    args = parser.parse_args()
+    setnames = args.setnames or ["Trainset"] * len(args.files)
+    if len(setnames) != len(args.files):
+        parser.error("one setname for every file")
+
+    german_stopwords = set(stopwords.words('german'))
+    tasks = []
+    for file, setname in zip(args.files, setnames):
+        tasks.extend(wordcloud_tasks(file, setname, german_stopwords))
+    render_wordclouds(tasks, args.workers)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,124 @@
+# This script compares loading a corpus from the .jsonl file with loading
+# the converted .corpus folder (corpus_store.py): load time and peak memory
+# (RSS) of each way, every one measured in its own process.
+#   jsonl     json.loads per line into dicts (like the scripts before)
+#   records   Corpus(...).records(), the same dicts from the .corpus folder
+#   arrays    Corpus(...) memory mapped, text lengths and label counts from
+#             the arrays (what the analysis and scoring need)
+# Without --data a synthetic corpus with --entries texts is written.
+# Start: python benchmark_corpus_store.py --entries 200000
+
+# Date: October 17, 2026
+
+# import libraries
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from corpus_store import LABELS, Corpus
+
+MODES = ["baseline", "jsonl", "records", "arrays"]
+
+
+# corpus with random texts and 4 to 10 annotations per text
+def write_synthetic(path, entries, seed=0):
+    rng = random.Random(seed)
+    words = ["Frauen", "sind", "nicht", "immer", "die", "besseren",
+             "Menschen", "Kommentar", "Zeitung", "Artikel", "wirklich"]
+    annotators = [f"A{str(i).zfill(3)}" for i in range(1, 13)]
+    with open(path, 'w', encoding='utf-8') as file:
+        for i in range(entries):
+            text = " ".join(rng.choices(words, k=rng.randint(5, 60)))
+            users = rng.sample(annotators, rng.randint(4, 10))
+            annotations = [{"user": user, "label": rng.choice(LABELS)}
+                           for user in users]
+            file.write(json.dumps({"id": f"{i:032x}", "text": text,
+                                   "annotations": annotations},
+                                  ensure_ascii=False) + '\n')
+
+
+# load the corpus in one way, runs in its own process
+def load(mode, jsonl_path, corpus_path):
+    if mode == "jsonl":
+        with open(jsonl_path, 'r', encoding='utf-8') as file:
+            data = [json.loads(line.strip()) for line in file]
+        return len(data)
+    if mode == "records":
+        return len(list(Corpus(corpus_path).records()))
+    if mode == "arrays":
+        corpus = Corpus(corpus_path)
+        np.asarray(corpus.text_lengths).max()
+        np.bincount(corpus.label_codes[corpus.label_codes >= 0],
+                    minlength=len(LABELS))
+        return len(corpus)
+    return 0
+
+
+# peak RSS of this process in MB (ru_maxrss is KB on linux, bytes on macos)
+def peak_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def child(mode, jsonl_path, corpus_path):
+    start = time.perf_counter()
+    entries = load(mode, jsonl_path, corpus_path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"mode": mode, "entries": entries, "seconds": elapsed,
+                      "rss": peak_rss()}))
+
+
+def measure(mode, jsonl_path, corpus_path):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode,
+         "--data", jsonl_path, "--corpus", corpus_path],
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load time and memory of .jsonl vs .corpus')
+    parser.add_argument("--data", help='Corpus (.jsonl), default: synthetic')
+    parser.add_argument("--corpus", help='Converted corpus, default: in a '
+                        'temporary folder')
+    parser.add_argument("--entries", type=int, default=200000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.data, args.corpus)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        jsonl_path = args.data
+        if jsonl_path is None:
+            jsonl_path = os.path.join(folder, "synthetic.jsonl")
+            print(f"Writing a synthetic corpus with {args.entries} texts")
+            write_synthetic(jsonl_path, args.entries)
+        corpus_path = args.corpus or os.path.join(folder, "benchmark.corpus")
+        # converted in another process, so this one stays small (the peak
+        # RSS of a child starts at the size of this process)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "corpus_store.py"),
+            jsonl_path, corpus_path], check=True, capture_output=True)
+        print(f"Conversion: {time.perf_counter() - start:.2f}s")
+        baseline = measure("baseline", jsonl_path, corpus_path)["rss"]
+        print(f"{'mode':<8} {'entries':>8} {'load':>8} {'RSS':>10}")
+        for mode in MODES[1:]:
+            result = measure(mode, jsonl_path, corpus_path)
+            print(f"{mode:<8} {result['entries']:>8} "
+                  f"{result['seconds']:>7.2f}s "
+                  f"{result['rss'] - baseline:>7.1f} MB")
+        print("RSS above a process that only imports the modules "
+              f"({baseline:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
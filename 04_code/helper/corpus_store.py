@@ -0,0 +1,210 @@
+# This script converts a corpus (.jsonl, one text with id, text and
+# annotations or annotators per line) into a compact columnar folder
+# ([name].corpus) that is loaded without parsing JSON:
+#   ids.npy, texts.npy            utf-8 bytes of all ids / texts, one after
+#                                 the other
+#   id_offsets.npy,               entry i is offsets[i]:offsets[i + 1] of
+#   text_offsets.npy              the bytes
+#   text_lengths.npy              length of every text in characters
+#   annotation_offsets.npy        annotations of entry i (CSR like)
+#   annotator_codes.npy           annotator of every annotation
+#   label_codes.npy               label of every annotation, -1 without label
+#   meta.json                     annotator names (order of first appearance)
+#                                 and labels
+# All arrays are .npy files and are memory mapped when loaded.
+# The loader (Corpus, read_records) is used by the prediction, scoring,
+# evaluation and analysis scripts, they accept a .jsonl or a .corpus path.
+# Start: python corpus_store.py ../../01_data/[name].jsonl
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+import sys
+import numpy as np
+
+LABELS = ["0-Kein", "1-Gering", "2-Vorhanden", "3-Stark", "4-Extrem"]
+CORPUS_SUFFIX = ".corpus"
+FORMAT_VERSION = 1
+
+
+# true if the path is a converted corpus folder
+def is_corpus(path):
+    return os.path.isdir(path) and os.path.exists(
+        os.path.join(path, "meta.json"))
+
+
+# utf-8 bytes of the strings one after the other and their offsets
+def pack_strings(strings):
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+# convert a .jsonl corpus into a .corpus folder (default: next to the input)
+def convert_jsonl(jsonl_path, corpus_path=None):
+    if corpus_path is None:
+        corpus_path = os.path.splitext(jsonl_path)[0] + CORPUS_SUFFIX
+    label_index = {label: code for code, label in enumerate(LABELS)}
+    annotator_index = {}
+    ids, texts = [], []
+    offsets = [0]
+    annotator_codes, label_codes = [], []
+    with open(jsonl_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            entry = json.loads(line.strip())
+            ids.append(entry["id"])
+            texts.append(entry["text"])
+            # Handle different key names for annotators
+            if "annotations" in entry:
+                pairs = [(annotation["user"], annotation["label"])
+                         for annotation in entry["annotations"]]
+            else:
+                pairs = [(user, None) for user in entry.get("annotators", [])]
+            for user, label in pairs:
+                if user not in annotator_index:
+                    annotator_index[user] = len(annotator_index)
+                annotator_codes.append(annotator_index[user])
+                label_codes.append(-1 if label is None
+                                   else label_index[label])
+            offsets.append(len(annotator_codes))
+
+    os.makedirs(corpus_path, exist_ok=True)
+    id_bytes, id_offsets = pack_strings(ids)
+    text_bytes, text_offsets = pack_strings(texts)
+    arrays = {
+        "ids": id_bytes, "id_offsets": id_offsets,
+        "texts": text_bytes, "text_offsets": text_offsets,
+        "text_lengths": np.array([len(text) for text in texts],
+                                 dtype=np.int32),
+        "annotation_offsets": np.array(offsets, dtype=np.int64),
+        "annotator_codes": np.array(annotator_codes, dtype=np.int16),
+        "label_codes": np.array(label_codes, dtype=np.int8),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(corpus_path, f"{name}.npy"), array)
+    meta = {"version": FORMAT_VERSION, "entries": len(ids),
+            "annotators": list(annotator_index), "labels": LABELS,
+            "source": os.path.basename(jsonl_path)}
+    with open(os.path.join(corpus_path, "meta.json"), 'w',
+              encoding='utf-8') as file:
+        json.dump(meta, file, ensure_ascii=False, indent=2)
+    return corpus_path
+
+
+# a converted corpus, the arrays are memory mapped
+class Corpus:
+    def __init__(self, corpus_path, mmap=True):
+        with open(os.path.join(corpus_path, "meta.json"), 'r',
+                  encoding='utf-8') as file:
+            meta = json.load(file)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unknown corpus version {meta['version']} of "
+                             f"{corpus_path}, convert it again")
+        self.path = corpus_path
+        self.annotator_names = meta["annotators"]
+        self.labels = meta["labels"]
+        mode = 'r' if mmap else None
+        for name in ("ids", "id_offsets", "texts", "text_offsets",
+                     "text_lengths", "annotation_offsets", "annotator_codes",
+                     "label_codes"):
+            setattr(self, name, np.load(
+                os.path.join(corpus_path, f"{name}.npy"), mmap_mode=mode))
+
+    def __len__(self):
+        return len(self.text_lengths)
+
+    def id(self, i):
+        return bytes(self.ids[self.id_offsets[i]:self.id_offsets[i + 1]]
+                     ).decode("utf-8")
+
+    def text(self, i):
+        start, end = self.text_offsets[i], self.text_offsets[i + 1]
+        return bytes(self.texts[start:end]).decode("utf-8")
+
+    # all ids as list, decoded at once
+    def id_list(self):
+        return self.decode_all(self.ids, self.id_offsets)
+
+    # all texts as list, decoded at once
+    def text_list(self):
+        return self.decode_all(self.texts, self.text_offsets)
+
+    @staticmethod
+    def decode_all(buffer, offsets):
+        data = bytes(buffer)
+        return [data[start:end].decode("utf-8")
+                for start, end in zip(offsets[:-1].tolist(),
+                                      offsets[1:].tolist())]
+
+    # first and last + 1 annotation of entry i
+    def annotation_span(self, i):
+        return self.annotation_offsets[i], self.annotation_offsets[i + 1]
+
+    # annotator names of entry i
+    def annotators(self, i):
+        start, end = self.annotation_span(i)
+        return [self.annotator_names[code]
+                for code in self.annotator_codes[start:end].tolist()]
+
+    # annotations of entry i like in the .jsonl file (without labels:
+    # label None)
+    def annotations(self, i):
+        start, end = self.annotation_span(i)
+        return [{"user": self.annotator_names[user],
+                 "label": self.labels[label] if label >= 0 else None}
+                for user, label in zip(
+                    self.annotator_codes[start:end].tolist(),
+                    self.label_codes[start:end].tolist())]
+
+    # entry index of every annotation
+    def annotation_entries(self):
+        return np.repeat(np.arange(len(self)),
+                         np.diff(self.annotation_offsets))
+
+    # the entries as dicts like the lines of the .jsonl file
+    def records(self):
+        ids, texts = self.id_list(), self.text_list()
+        # names of all annotations at once, not per entry
+        users = [self.annotator_names[code]
+                 for code in self.annotator_codes.tolist()]
+        labels = [self.labels[code] if code >= 0 else None
+                  for code in self.label_codes.tolist()]
+        offsets = self.annotation_offsets.tolist()
+        for i in range(len(self)):
+            start, end = offsets[i], offsets[i + 1]
+            record = {"id": ids[i], "text": texts[i]}
+            if None in labels[start:end]:
+                record["annotators"] = users[start:end]
+            else:
+                record["annotations"] = [
+                    {"user": user, "label": label}
+                    for user, label in zip(users[start:end],
+                                           labels[start:end])]
+            yield record
+
+
+# the entries of a .jsonl file or a .corpus folder as dicts
+def read_records(path, encoding='utf-8'):
+    if is_corpus(path):
+        yield from Corpus(path).records()
+        return
+    with open(path, 'r', encoding=encoding) as file:
+        for line in file:
+            yield json.loads(line.strip())
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python corpus_store.py [name].jsonl [[name].corpus]")
+        return 1
+    corpus_path = convert_jsonl(*sys.argv[1:])
+    corpus = Corpus(corpus_path)
+    print(f"Converted {len(corpus)} entries with "
+          f"{len(corpus.annotator_codes)} annotations into {corpus_path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# This script builds the few shot examples of all annotators in one run
+# (splitting_traindata.py and generate_examples.py in one step): the trainset
+# (.jsonl or .corpus folder) is read once into arrays with the annotator,
+# label and text length of every annotation, and for every number of
+# examples per label (--n) and every seed (--seeds) a folder
+# [n * 5]_shot_examples_seed[seed] with one [annotator].jsonl is written
+# (format of generate_examples.py, the examples grouped by label).
+# Every annotation gets a random key from the seed and the examples of an
+# annotator and label are the ones with the smallest keys, so a seed always
+# gives the same examples and the examples of a smaller n are part of the
+# ones of a larger n.
+# With --split-dir the annotator files of splitting_traindata.py are written
+# as well.
+# Start: python example_pool.py --input ../../01_data/[name].jsonl
+#            --n 1 2 --seeds 0 1 2 3 4
+
+# Date: October 17, 2026
+
+# import libraries
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from corpus_store import LABELS, Corpus, is_corpus, read_records
+
+
+# the annotations of the trainset as arrays
+class ExamplePool:
+    def __init__(self, ids, texts, annotators, entries, annotator_codes,
+                 label_codes):
+        # per entry
+        self.ids = ids
+        self.texts = texts
+        self.text_lengths = np.array([len(text) for text in texts],
+                                     dtype=np.int32)
+        # annotator names in the order of their first annotation
+        self.annotators = annotators
+        # per annotation: entry index, annotator and label code (-1 without
+        # label)
+        self.entries = entries
+        self.annotator_codes = annotator_codes
+        self.label_codes = label_codes
+
+    # codes of the annotator names, all annotators without names
+    def annotator_selection(self, annotators=None):
+        if annotators is None:
+            return np.arange(len(self.annotators))
+        return np.array([self.annotators.index(name) for name in annotators
+                         if name in self.annotators], dtype=np.int64)
+
+    # annotations with a label by the annotators with a text of at most
+    # max_chars characters
+    def candidates(self, max_chars=150, annotators=None):
+        mask = ((self.label_codes >= 0)
+                & (self.text_lengths[self.entries] <= max_chars)
+                & np.isin(self.annotator_codes,
+                          self.annotator_selection(annotators)))
+        return np.flatnonzero(mask)
+
+    # (annotator, label) pairs with less than n candidates
+    def shortages(self, n, max_chars=150, annotators=None):
+        candidates = self.candidates(max_chars, annotators)
+        counts = np.bincount(
+            self.annotator_codes[candidates].astype(np.int64) * len(LABELS)
+            + self.label_codes[candidates],
+            minlength=len(self.annotators) * len(LABELS)
+        ).reshape(len(self.annotators), len(LABELS))
+        return [(self.annotators[annotator], LABELS[label],
+                 int(counts[annotator, label]))
+                for annotator, label in zip(*np.nonzero((counts > 0)
+                                                        & (counts < n)))]
+
+    # n random annotations per annotator and label (all if there are fewer),
+    # sorted by annotator, label and key
+    def select(self, n, seed, max_chars=150, annotators=None):
+        # a key for every annotation, independent of the filters
+        keys = np.random.default_rng(seed).random(len(self.annotator_codes))
+        candidates = self.candidates(max_chars, annotators)
+        order = candidates[np.lexsort((keys[candidates],
+                                       self.label_codes[candidates],
+                                       self.annotator_codes[candidates]))]
+        groups = (self.annotator_codes[order].astype(np.int64) * len(LABELS)
+                  + self.label_codes[order])
+        # position of every annotation in its (annotator, label) group
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = groups[1:] != groups[:-1]
+        positions = np.arange(len(order))
+        rank = positions - np.maximum.accumulate(np.where(starts, positions,
+                                                          0))
+        return order[rank < n]
+
+    # one annotation as entry like in the annotator files
+    def entry(self, index):
+        entry = self.entries[index]
+        return {
+            'id': self.ids[entry],
+            'text': self.texts[entry],
+            'annotations': [{
+                'user': self.annotators[self.annotator_codes[index]],
+                'label': LABELS[self.label_codes[index]]}]
+        }
+
+    # write the annotations (sorted by annotator) into one file per
+    # annotator, returns the number of entries per file (annotators without
+    # annotations get an empty file with write_empty, otherwise no file)
+    def write_annotator_files(self, indices, output_dir, annotators=None,
+                              ensure_ascii=True, write_empty=False):
+        os.makedirs(output_dir, exist_ok=True)
+        codes = self.annotator_codes[indices]
+        if annotators is None:
+            annotators = [self.annotators[code]
+                          for code in np.unique(codes).tolist()]
+        saved = {}
+        for name in annotators:
+            if name in self.annotators:
+                code = self.annotators.index(name)
+                start, end = np.searchsorted(codes, [code, code + 1])
+            else:
+                start = end = 0
+            if start == end:
+                print(f"No data found for {name}.")
+                if not write_empty:
+                    continue
+            output_file = os.path.join(output_dir, f'{name}.jsonl')
+            with open(output_file, 'w', encoding='utf-8') as file:
+                for index in indices[start:end].tolist():
+                    file.write(json.dumps(self.entry(index),
+                                          ensure_ascii=ensure_ascii) + '\n')
+            saved[name] = int(end - start)
+        return saved
+
+    # the annotator files of splitting_traindata.py: all annotations of an
+    # annotator sorted by label, otherwise in the order of the trainset. Like
+    # splitting_traindata.py every annotator gets a file, even an empty one
+    def write_splits(self, output_dir, annotators=None):
+        order = np.lexsort((self.label_codes, self.annotator_codes))
+        order = order[self.label_codes[order] >= 0]
+        return self.write_annotator_files(order, output_dir, annotators,
+                                          ensure_ascii=False,
+                                          write_empty=True)
+
+
+# read the trainset once, a .corpus folder already has the arrays
+def load_pool(file_path):
+    if is_corpus(file_path):
+        corpus = Corpus(file_path)
+        return ExamplePool(corpus.id_list(), corpus.text_list(),
+                           corpus.annotator_names,
+                           corpus.annotation_entries(),
+                           np.asarray(corpus.annotator_codes),
+                           np.asarray(corpus.label_codes))
+    label_index = {label: code for code, label in enumerate(LABELS)}
+    annotator_index = {}
+    ids, texts = [], []
+    entries, annotator_codes, label_codes = [], [], []
+    for entry in read_records(file_path):
+        ids.append(entry['id'])
+        texts.append(entry['text'])
+        for annotation in entry.get('annotations', []):
+            user = annotation['user']
+            if user not in annotator_index:
+                annotator_index[user] = len(annotator_index)
+            entries.append(len(ids) - 1)
+            annotator_codes.append(annotator_index[user])
+            label_codes.append(label_index[annotation['label']])
+    return ExamplePool(ids, texts, list(annotator_index),
+                       np.array(entries, dtype=np.int64),
+                       np.array(annotator_codes, dtype=np.int16),
+                       np.array(label_codes, dtype=np.int8))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Few shot examples of all annotators for several seeds')
+    parser.add_argument("--input", required=True,
+                        help='Trainset (.jsonl or .corpus folder)')
+    parser.add_argument("--output-dir", default="../../02_few_shot_examples",
+                        help='A folder [n * 5]_shot_examples_seed[seed] per '
+                        'n and seed is created in it')
+    parser.add_argument("--n", type=int, nargs="+", default=[1, 2],
+                        help='Examples per label')
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--max-chars", type=int, default=150,
+                        help='Maximum text length of an example')
+    parser.add_argument("--annotators", nargs="+",
+                        help='default: all annotators of the trainset')
+    parser.add_argument("--split-dir",
+                        help='Also write all annotations of every annotator '
+                        'sorted by label (splitting_traindata.py)')
+    args = parser.parse_args()
+
+    pool = load_pool(args.input)
+    print(f"Loaded {len(pool.ids)} texts with {len(pool.entries)} "
+          f"annotations of {len(pool.annotators)} annotators")
+    if args.split_dir:
+        saved = pool.write_splits(args.split_dir, args.annotators)
+        print(f"Saved the annotations of {len(saved)} annotators to "
+              f"{args.split_dir}")
+
+    for n in args.n:
+        for annotator, label, count in pool.shortages(n, args.max_chars,
+                                                      args.annotators):
+            print(f"Warning! Not enough examples for {annotator} ({label}): "
+                  f"{count} of {n}")
+        for seed in args.seeds:
+            output_dir = os.path.join(
+                args.output_dir,
+                f"{n * len(LABELS)}_shot_examples_seed{seed}")
+            selected = pool.select(n, seed, args.max_chars, args.annotators)
+            saved = pool.write_annotator_files(selected, output_dir,
+                                               args.annotators)
+            print(f"Saved {sum(saved.values())} examples of {len(saved)} "
+                  f"annotators to {output_dir}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,15 +10,14 @@ import os
 import sys
 import random
 from collections import defaultdict
+from corpus_store import read_records
 
 
-# load the data
+# load the data (.jsonl file or .corpus folder)
 def load_jsonl(file_path, encoding='utf-8'):
     data = []
     try:
-        with open(file_path, 'r', encoding=encoding) as file:
-            for line in file:
-                data.append(json.loads(line))
+        data.extend(read_records(file_path, encoding))
     except FileNotFoundError:
         print(f"File not found: {file_path}")
     return data
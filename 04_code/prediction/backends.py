@@ -0,0 +1,230 @@
+# Backends for the prediction pipeline. A backend builds the request for the
+# API, sends it and reads the answer, the usage and the finish reason from
+# the raw response. HTTP errors are raised as StatusError (retry.py).
+# - FireworksBackend: fireworks chat completions over HTTP (Mixtral), async
+#   aiohttp session with a keep-alive connection pool
+# - SyncFireworksBackend: same with a pooled requests session, the blocking
+#   calls run in threads
+# - OpenAIBackend: openai SDK with function calling (GPT)
+# - FakeBackend: answers locally without network, for tests
+# Add own API keys in config.py
+
+# Date: October 17, 2026
+
+# import libraries
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+import requests
+from openai import AsyncOpenAI, OpenAI
+from config import API_KEY_FIREWORKS, API_KEY_OPENAI
+from mock_answers import buildResponse
+from http_timing import TimedAdapter, requestContext, traceConfig
+from retry import StatusError, parseRetryAfter
+
+
+# response of the API can't be used
+class ResponseError(Exception):
+    pass
+
+
+class FireworksBackend:
+    url = "https://api.fireworks.ai/inference/v1/chat/completions"
+    defaultModel = "accounts/fireworks/models/mixtral-8x7b-instruct"
+
+    # maxConnections: size of the connection pool; timeouts in seconds,
+    # keepAlive = seconds an idle connection stays open; stats: LatencyStats
+    # (http_timing.py) for the connect/first byte/total time per request
+    def __init__(self, model=None, apiKey=API_KEY_FIREWORKS, url=None,
+                 maxConnections=16, timeout=120.0, connectTimeout=10.0,
+                 keepAlive=30.0, stats=None):
+        self.model = model or self.defaultModel
+        if url is not None:
+            self.url = url
+        self.maxConnections = maxConnections
+        self.timeout = timeout
+        self.connectTimeout = connectTimeout
+        self.keepAlive = keepAlive
+        self.stats = stats
+        # header for the call; Key needed
+        self.headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {apiKey}",
+        }
+        self.session = None
+
+    def buildRequest(self, messages, schema):
+        return {
+            "model": self.model,
+            "max_tokens": 1024,
+            "top_p": 1,
+            "top_k": 40,
+            "presence_penalty": 0,
+            "frequency_penalty": 0,
+            "temperature": 0.0,
+            "response_format": {"type": "json_object", "schema": schema},
+            "messages": messages
+        }
+
+    # raw response as dict; HTTP errors are raised as StatusError
+    def decode(self, status, body, retryAfter):
+        if status >= 400:
+            raise StatusError(status, body, parseRetryAfter(retryAfter))
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError:
+            raise ResponseError("Request didn't work, no JSON as return")
+
+    async def send(self, request):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.maxConnections, keepalive_timeout=self.keepAlive)
+            self.session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.timeout, sock_connect=self.connectTimeout),
+                trace_configs=[traceConfig()] if self.stats else None)
+        timing = requestContext()
+        async with self.session.post(self.url, data=json.dumps(request),
+                                     trace_request_ctx=timing) as response:
+            body = await response.text()
+        if self.stats:
+            self.stats.add(timing.connect, timing.ttfb,
+                           time.perf_counter() - timing.start,
+                           timing.newConnection)
+        return self.decode(response.status, body,
+                           response.headers.get("Retry-After"))
+
+    # returns the answer (json), the finish reason and the usage
+    def parseResponse(self, response_data):
+        if not response_data.get('choices'):
+            raise ResponseError("Request didn't work, no JSON as return")
+        check = response_data['choices'][0]
+        if 'message' not in check or 'content' not in check['message']:
+            raise ResponseError("Invalid response format")
+        try:
+            json_answer = json.loads(check['message']['content'])
+        except (json.JSONDecodeError, TypeError):
+            raise ResponseError("JSON decode error")
+        return json_answer, check.get('finish_reason'), response_data['usage']
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.stats:
+            self.stats.close()
+
+
+class SyncFireworksBackend(FireworksBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # one thread per connection of the pool
+        self.executor = ThreadPoolExecutor(max_workers=self.maxConnections)
+
+    def getSession(self):
+        if self.session is None:
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = TimedAdapter(poolSize=self.maxConnections)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        return self.session
+
+    # blocking request, can also be used without the pipeline
+    def sendSync(self, request):
+        session = self.getSession()
+        start = TimedAdapter.startTiming()
+        response = session.post(self.url, data=json.dumps(request),
+                                timeout=(self.connectTimeout, self.timeout))
+        body = response.text
+        if self.stats:
+            connect = TimedAdapter.connectTime()
+            self.stats.add(connect,
+                           response.elapsed.total_seconds() - connect,
+                           time.perf_counter() - start, connect > 0)
+        return self.decode(response.status_code, body,
+                           response.headers.get("Retry-After"))
+
+    async def send(self, request):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, self.sendSync, request)
+
+    async def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        if self.stats:
+            self.stats.close()
+
+
+class OpenAIBackend:
+    defaultModel = "gpt-4o-mini"
+
+    # baseUrl is only needed for a local stand-in of the API
+    def __init__(self, model=None, apiKey=API_KEY_OPENAI, baseUrl=None):
+        self.model = model or self.defaultModel
+        # the retries are done by the pipeline (retry.py)
+        self.client = AsyncOpenAI(api_key=apiKey, base_url=baseUrl,
+                                  max_retries=0)
+        # blocking client for the batch API (batch.py)
+        self.batchClient = OpenAI(api_key=apiKey, base_url=baseUrl)
+
+    def buildRequest(self, messages, schema):
+        return {
+            "model": self.model,
+            "temperature": 0,
+            "messages": messages,
+            "function_call": "auto",
+            "functions": [{
+                "name": "annotate",
+                "parameters": schema
+            }]
+        }
+
+    async def send(self, request):
+        response = await self.client.chat.completions.create(**request)
+        return response.model_dump()
+
+    # the answer is either in the function call or in the content; in the
+    # content the model sometimes imitates the examples with single quotes
+    def parseResponse(self, response_data):
+        if not response_data.get('choices'):
+            raise ResponseError("Request didn't work, no JSON as return")
+        check = response_data['choices'][0]
+        message = check.get('message')
+        if not message:
+            raise ResponseError("Invalid response format")
+        try:
+            if message.get('content') is not None:
+                json_answer = json.loads(message['content'].replace("'", '"'))
+            elif message.get('function_call'):
+                json_answer = json.loads(message['function_call']['arguments'])
+            else:
+                raise ResponseError("Invalid response format")
+        except json.JSONDecodeError:
+            raise ResponseError("JSON decode error")
+        return json_answer, check.get('finish_reason'), response_data['usage']
+
+    async def close(self):
+        await self.client.close()
+        self.batchClient.close()
+
+
+# answers like mock_server.py (mock_answers.py) but without a server;
+# latency in seconds
+class FakeBackend(FireworksBackend):
+    defaultModel = "fake"
+
+    def __init__(self, model=None, latency=0.0):
+        super().__init__(model=model, apiKey="")
+        self.latency = latency
+
+    async def send(self, request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return buildResponse(request)
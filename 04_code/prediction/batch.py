@@ -0,0 +1,209 @@
+# Batch mode of the prediction pipeline for the openai batch API. All
+# requests of the corpus are written into batch files (JSONL, one request per
+# line), uploaded and submitted as batches. The batches are polled until they
+# are finished, then the output is split up again and saved in the order of
+# the corpus in result.jsonl and result_token.jsonl like a normal run.
+# The ids of the submitted batches and the batch files not submitted yet are
+# saved next to result.jsonl ({resultPath}.batch), a second start polls these
+# batches and submits the remaining files instead of submitting the requests
+# again.
+# Start it with predict.py --backend openai --batch
+
+# Date: October 17, 2026
+
+# import libraries
+import asyncio
+import json
+import os
+import time
+from checkpoint import removeCheckpoint
+from pipeline import Pipeline, unitName
+
+ENDPOINT = "/v1/chat/completions"
+# limit of the openai batch API per batch
+MAX_REQUESTS = 50000
+FINISHED = ("completed", "failed", "expired", "cancelled")
+
+
+def batchStatePath(resultPath):
+    return resultPath + ".batch"
+
+
+# custom_id of a request: id of the text and the annotators of the request
+def customId(key, name):
+    return json.dumps([key, name], ensure_ascii=False)
+
+
+# write the batch files, at most maxRequests requests per file; returns the
+# paths of the files
+def writeBatchFiles(requests, basePath, maxRequests=MAX_REQUESTS):
+    paths = []
+    file = None
+    for number, (custom_id, request) in enumerate(requests):
+        if number % maxRequests == 0:
+            if file:
+                file.close()
+            paths.append(f"{basePath}.input_{len(paths)}.jsonl")
+            file = open(paths[-1], 'w', encoding='utf-8')
+        file.write(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": request
+        }, ensure_ascii=False) + '\n')
+    if file:
+        file.close()
+    return paths
+
+
+# upload a batch file and start the batch; returns the id of the batch
+def submitBatch(client, path):
+    with open(path, 'rb') as file:
+        inputFile = client.files.create(file=file, purpose="batch")
+    batch = client.batches.create(input_file_id=inputFile.id,
+                                  endpoint=ENDPOINT,
+                                  completion_window="24h")
+    print(f"Submitted {path} as {batch.id}")
+    return batch.id
+
+
+# wait until the batch is finished; returns the batch
+def pollBatch(client, batchId, pollInterval=60.0):
+    while True:
+        batch = client.batches.retrieve(batchId)
+        if batch.status in FINISHED:
+            print(f"Batch {batchId} {batch.status}")
+            return batch
+        counts = batch.request_counts
+        if counts:
+            print(f"Batch {batchId} {batch.status}: "
+                  f"{counts.completed}/{counts.total} requests done")
+        time.sleep(pollInterval)
+
+
+# lines of the output and error file of a finished batch
+def collectBatch(client, batch):
+    for fileId in (batch.output_file_id, batch.error_file_id):
+        if not fileId:
+            continue
+        for line in client.files.content(fileId).text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+
+class BatchPipeline(Pipeline):
+    def __init__(self, backend, strategy, resultPath, resultTokensPath,
+                 errorPath, pollInterval=60.0, maxRequests=MAX_REQUESTS,
+                 **options):
+        super().__init__(backend, strategy, resultPath, resultTokensPath,
+                         errorPath, **options)
+        self.client = backend.batchClient
+        self.pollInterval = pollInterval
+        self.maxRequests = maxRequests
+        self.statePath = batchStatePath(resultPath)
+
+    # all missing requests of the corpus; requests in the response cache are
+    # answered at once and not sent
+    def collectRequests(self, pending, results):
+        requests = []
+        for key, (text, units, answered) in pending.items():
+            for unit in units:
+                name = unitName(unit)
+                if name in answered:
+                    continue
+                request = self.backend.buildRequest(
+                    self.strategy.messages(text, unit),
+                    self.strategy.schema(unit))
+                cached = self.responseCache.get(request) \
+                    if self.responseCache else None
+                if cached is not None:
+                    results[key][name] = self.processResponse(key, unit,
+                                                              cached)
+                else:
+                    requests.append((customId(key, name), request))
+        return requests
+
+    # submitted batches and batch files still to submit
+    def saveState(self, batchIds, paths):
+        with open(self.statePath, 'w', encoding='utf-8') as file:
+            json.dump({"batches": batchIds, "pending": paths}, file)
+
+    # submit the requests or take the batches of an earlier start; batch
+    # files the earlier start did not submit are submitted now
+    def submit(self, requests):
+        if os.path.exists(self.statePath):
+            with open(self.statePath, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+            batchIds, paths = state["batches"], state.get("pending", [])
+            print(f"Polling {len(batchIds)} submitted batches again, "
+                  f"{len(paths)} batch files still to submit")
+        else:
+            paths = writeBatchFiles(requests, self.statePath,
+                                    self.maxRequests)
+            batchIds = []
+            self.saveState(batchIds, paths)
+
+        while paths:
+            batchIds.append(submitBatch(self.client, paths[0]))
+            # save after every batch, a crash must not submit it twice
+            submitted = paths.pop(0)
+            self.saveState(batchIds, paths)
+            os.remove(submitted)
+        return batchIds
+
+    # split the output of a batch into the results of the texts
+    def demultiplex(self, batch, pending, results):
+        for line in collectBatch(self.client, batch):
+            key, name = json.loads(line["custom_id"])
+            if key not in pending:
+                continue
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                error = line.get("error") or response.get("body", {})
+                print(f"Error at {key}: {error}")
+                self.writer.writeError(key, "batch", str(error),
+                                       annotators=name,
+                                       status=response.get("status_code"))
+                continue
+            unit = name.split(", ")
+            result = self.processResponse(key, unit, response["body"])
+            if result is not None and self.responseCache:
+                self.responseCache.put(self.backend.buildRequest(
+                    self.strategy.messages(pending[key][0], unit),
+                    self.strategy.schema(unit)), response["body"])
+            results[key][name] = result
+
+    def run(self, dataPath):
+        pending = self.open(dataPath)
+        results = {key: {} for key in pending}
+        try:
+            requests = self.collectRequests(pending, results)
+            if requests or os.path.exists(self.statePath):
+                for batchId in self.submit(requests):
+                    batch = pollBatch(self.client, batchId, self.pollInterval)
+                    self.demultiplex(batch, pending, results)
+
+            for key, (text, units, answered) in pending.items():
+                for unit in units:
+                    name = unitName(unit)
+                    if name not in answered and name not in results[key]:
+                        self.writer.writeError(key, "batch",
+                                               "No result in batch",
+                                               annotators=name)
+                self.saveText(key, text, units, answered, results[key])
+        finally:
+            # closes the batch client and the AsyncOpenAI client
+            asyncio.run(self.backend.close())
+            self.writer.close()
+        # all batches are saved, the next start submits new ones
+        if os.path.exists(self.statePath):
+            os.remove(self.statePath)
+        removeCheckpoint(self.resultPath)
+
+
+# run the batch pipeline for a corpus
+def batchCall(backend, strategy, dataPath, resultPath, resultTokensPath,
+              errorPath, **options):
+    pipeline = BatchPipeline(backend, strategy, resultPath, resultTokensPath,
+                             errorPath, **options)
+    pipeline.run(dataPath)
@@ -0,0 +1,83 @@
+# This script measures the time to build the messages for 10k requests with
+# the old generateMessage (prompt and example files are read again for every
+# request) and with the prompt cache (prompt_cache.py).
+# Uses the examples in 02_few_shot_examples and a prompt of 03_input.
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+import sys
+import time
+from prompt_cache import INSTRUCTION, buildPromptCache, generateMessage
+
+
+# generateMessage before the prompt cache (reads the prompt and opens the
+# examples file n_shot times for every request)
+def generateMessageUncached(promptPath, annotator, text, n_shot, examplesDir):
+    with open(promptPath, "r", encoding="utf-8") as file:
+        prompt = file.read()
+    message = []
+
+    systemMessage = {'role': 'system', 'content': prompt}
+    message.append(systemMessage)
+
+    for n in range(n_shot):
+        examplesJson = f'{examplesDir}/{annotator}.jsonl'
+        with open(examplesJson, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, start=1):
+                if line_number == n + 1:
+                    data = json.loads(line)
+
+        exampleText = data["text"] + INSTRUCTION
+        exampleResponse = data["annotations"]
+        message.append({'role': 'user', 'content': exampleText})
+        message.append({'role': 'assistant', 'content': str(exampleResponse)})
+
+    message.append({'role': 'user', 'content': text + INSTRUCTION})
+    return message
+
+
+def benchmark(promptPath, sourceDir, n_shot, requests):
+    examplesDir = os.path.join(sourceDir, f'{n_shot}_shot_examples')
+    annotators = sorted(f[:-6] for f in os.listdir(examplesDir))
+    text = "Beispiel Text zur Erkennung von Sexismus und Frauenfeindlichkeit"
+
+    start = time.perf_counter()
+    for i in range(requests):
+        annotator = annotators[i % len(annotators)]
+        generateMessageUncached(promptPath, annotator, text, n_shot,
+                                examplesDir)
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(promptPath, "r", encoding="utf-8") as file:
+        prompt = file.read()
+    promptCache = buildPromptCache(prompt, annotators, n_shot, examplesDir)
+    for i in range(requests):
+        generateMessage(promptCache, annotators[i % len(annotators)], text)
+    cached = time.perf_counter() - start
+
+    # both ways have to produce the same messages
+    for annotator in annotators:
+        assert generateMessage(promptCache, annotator, text) == \
+            generateMessageUncached(promptPath, annotator, text, n_shot,
+                                    examplesDir)
+
+    print(f"{n_shot} shot, {requests} requests")
+    print(f"  without cache: {uncached:.3f} s")
+    print(f"  with cache:    {cached:.3f} s (incl. building the cache)")
+    print(f"  speedup:       {uncached / cached:.1f}x")
+
+
+def main():
+    promptPath = "../../03_input/input_fireworks/5_shot_mixtral_8x7B/basic_prompt.txt"  # noqa: E501
+    sourceDir = "../../02_few_shot_examples"
+    requests = 10000
+    for n_shot in [5, 10]:
+        benchmark(promptPath, sourceDir, n_shot, requests)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# Resume for the prediction scripts. Every answer of an annotator is written
+# to a small checkpoint file next to result.jsonl ({resultPath}.checkpoint),
+# so a run that died mid-corpus only has to query the missing
+# (id, annotator) pairs when it's started again. It is removed after a
+# complete run. The files are flushed one by one, so after a crash
+# result_token.jsonl can contain the usage of requests that are sent again;
+# these lines are removed on resume.
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+
+
+# path of the checkpoint for a result file
+def checkpointPath(resultPath):
+    return resultPath + ".checkpoint"
+
+
+# remove the checkpoint after a complete run: every answer is in
+# result.jsonl then, a resume reads the partly answered texts from there
+def removeCheckpoint(resultPath):
+    checkpointFile = checkpointPath(resultPath)
+    if os.path.exists(checkpointFile):
+        os.remove(checkpointFile)
+
+
+# save the annotations of one annotator for one text
+def saveCheckpoint(checkpointFile, key, annotator, annotations):
+    with open(checkpointFile, 'a', encoding='utf-8') as file:
+        data = {
+            "id": key,
+            "user": annotator,
+            "annotations": annotations
+        }
+        json.dump(data, file, ensure_ascii=False)
+        file.write('\n')
+
+
+# load the checkpoint; key = id, value = dict annotator -> annotations
+def loadCheckpoint(checkpointFile):
+    completed = {}
+    if os.path.exists(checkpointFile):
+        with open(checkpointFile, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # last line of a run that was killed while writing
+                    continue
+                completed.setdefault(entry["id"], {})[entry["user"]] = \
+                    entry["annotations"]
+    return completed
+
+
+# load the results; key = id, value = last line saved for this id
+def loadResults(resultPath):
+    results = {}
+    if os.path.exists(resultPath):
+        with open(resultPath, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[entry["id"]] = entry
+    return results
+
+
+# ids which already have a result (zero shot: one request for all annotators)
+def loadDoneIds(resultPath):
+    return {key for key, entry in loadResults(resultPath).items()
+            if entry["annotations"]}
+
+
+# prepare the files for a resumed few shot run. units gives the requests of
+# a text (strategy.units), their annotations are restored under the unit
+# name when every annotator of the unit is in the result. Texts with all
+# units answered are done. Lines of texts with missing units are moved into
+# the checkpoint and removed from result.jsonl, so the text is saved again
+# (complete, without a duplicate id) when the missing units are done.
+# Returns the done ids and the completed annotations per id and unit name.
+def prepareResume(resultPath, resultTokensPath, corpus, units):
+    checkpointFile = checkpointPath(resultPath)
+    completed = loadCheckpoint(checkpointFile)
+    results = loadResults(resultPath)
+
+    doneIds = set()
+    for key, entry in results.items():
+        if key not in corpus:
+            doneIds.add(key)
+            continue
+        annotators = corpus[key][1].split(", ") if corpus[key][1] else []
+        answered = completed.setdefault(key, {})
+        byUser = {annotation.get("user"): annotation
+                  for annotation in entry["annotations"]}
+        textUnits = units(annotators)
+        for unit in textUnits:
+            name = ", ".join(unit)
+            if name not in answered and all(user in byUser for user in unit):
+                answered[name] = [byUser[user] for user in unit]
+                saveCheckpoint(checkpointFile, key, name, answered[name])
+        if len(entry["annotations"]) >= len(annotators) or \
+                all(", ".join(unit) in answered for unit in textUnits):
+            doneIds.add(key)
+
+    keepResults(resultPath, results, doneIds)
+    keepTokens(resultTokensPath, doneIds, completed)
+    print(f"Resume: {len(doneIds)} texts done, "
+          f"{sum(len(v) for v in completed.values())} answered requests in "
+          f"the checkpoint")
+    return doneIds, completed
+
+
+# prepare the files for a resumed run with one request per text (zero shot):
+# a text with annotations is done, even if the answer has fewer annotators
+# than the corpus. Lines without annotations are removed from result.jsonl,
+# these texts are sent again. Returns the done ids.
+def prepareTextResume(resultPath, resultTokensPath):
+    doneIds = loadDoneIds(resultPath)
+    keepResults(resultPath, loadResults(resultPath), doneIds)
+    keepTokens(resultTokensPath, doneIds)
+    print(f"Resume: {len(doneIds)} texts done")
+    return doneIds
+
+
+# write only the done texts back into result.jsonl
+def keepResults(resultPath, results, doneIds):
+    tmpPath = resultPath + ".tmp"
+    with open(tmpPath, 'w', encoding='utf-8') as file:
+        for key, entry in results.items():
+            if key in doneIds:
+                json.dump(entry, file, ensure_ascii=False)
+                file.write('\n')
+    os.replace(tmpPath, resultPath)
+
+
+# keep only the usage of requests that are not sent again: of done texts and
+# of annotators in the checkpoint (completed, keys can be several
+# annotators "A001, A002"). Only the last line per text and annotator is
+# kept.
+def keepTokens(resultTokensPath, doneIds, completed=None):
+    if not os.path.exists(resultTokensPath):
+        return
+    covered = {(key, annotator)
+               for key, answered in (completed or {}).items()
+               for name in answered for annotator in name.split(", ")}
+    tokens = {}
+    lines = 0
+    with open(resultTokensPath, 'r', encoding='utf-8') as file:
+        for line in file:
+            lines += 1
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            user = entry.get("user")
+            if entry["id"] in doneIds or (entry["id"], user) in covered:
+                tokens[(entry["id"], user)] = line.rstrip('\n') + '\n'
+    removed = lines - len(tokens)
+    tmpPath = resultTokensPath + ".tmp"
+    with open(tmpPath, 'w', encoding='utf-8') as file:
+        file.writelines(tokens.values())
+    os.replace(tmpPath, resultTokensPath)
+    if removed:
+        print(f"Resume: {removed} token lines of requests sent again removed")
@@ -0,0 +1,208 @@
+# Index of the trainset for few shot examples chosen per text: every text of
+# the trainset is turned once into a TF-IDF vector (hashed words and
+# character 3-grams, L2 normalized) and the vectors of the labelled
+# examples of every annotator are saved as one sparse matrix per annotator.
+# For the texts to predict the n most similar examples of the annotator
+# (cosine similarity) are searched for many texts at once, the most similar
+# example is the last one before the text.
+# Only numpy and scipy are needed, no model has to be downloaded.
+# Start: python example_index.py --input ../../01_data/[name].jsonl
+#            --index-dir ../../02_few_shot_examples/index
+# Used by predict.py --strategy few-shot-retrieval (see prompts.py).
+
+# Date: October 17, 2026
+
+# import libraries
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+import numpy as np
+from scipy import sparse
+
+# example_pool.py (trainset as arrays) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from example_pool import load_pool  # noqa: E402
+
+INDEX_VERSION = 1
+WORD_PATTERN = re.compile(r"\w+")
+
+
+# hashed features of a text: lower case words and the character 3-grams of
+# the words (with a space before and after the word)
+def textFeatures(text, dims):
+    features = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        features.append(zlib.crc32(word.encode('utf-8')) % dims)
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            features.append(zlib.crc32(
+                b"3:" + padded[i:i + 3].encode('utf-8')) % dims)
+    return features
+
+
+# term counts of the texts as sparse matrix (texts x dims)
+def countMatrix(texts, dims):
+    indices = []
+    offsets = [0]
+    for text in texts:
+        indices.extend(textFeatures(text, dims))
+        offsets.append(len(indices))
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32),
+         np.array(indices, dtype=np.int64), np.array(offsets, dtype=np.int64)),
+        shape=(len(texts), dims))
+    # duplicate features of a text are summed up
+    counts.sum_duplicates()
+    return counts
+
+
+# inverse document frequency of every feature (smoothed like scikit-learn)
+def inverseFrequency(counts):
+    documentFrequency = np.bincount(counts.indices,
+                                    minlength=counts.shape[1])
+    return (np.log((1 + counts.shape[0]) / (1 + documentFrequency))
+            + 1).astype(np.float32)
+
+
+# TF-IDF vectors with length 1 (sublinear term frequency)
+def weightMatrix(counts, idf):
+    weights = counts.copy()
+    weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1))
+                    ).ravel()
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(weights).tocsr().astype(np.float32)
+
+
+# build the index of a trainset (.jsonl or .corpus folder): idf.npy,
+# [annotator].npz with the vectors and [annotator].jsonl with the examples
+# in the same order
+def buildIndex(dataPath, indexDir, dims=2 ** 18, maxChars=150):
+    pool = load_pool(dataPath)
+    counts = countMatrix(pool.texts, dims)
+    idf = inverseFrequency(counts)
+    vectors = weightMatrix(counts, idf)
+    os.makedirs(indexDir, exist_ok=True)
+    np.save(os.path.join(indexDir, "idf.npy"), idf)
+    saved = {}
+    for annotator in pool.annotators:
+        candidates = pool.candidates(maxChars, [annotator])
+        sparse.save_npz(os.path.join(indexDir, f"{annotator}.npz"),
+                        vectors[pool.entries[candidates]])
+        with open(os.path.join(indexDir, f"{annotator}.jsonl"), 'w',
+                  encoding='utf-8') as file:
+            for index in candidates.tolist():
+                file.write(json.dumps(pool.entry(index)) + '\n')
+        saved[annotator] = len(candidates)
+    meta = {"version": INDEX_VERSION, "dims": dims, "maxChars": maxChars,
+            "examples": saved, "source": os.path.basename(dataPath)}
+    with open(os.path.join(indexDir, "meta.json"), 'w',
+              encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+    return saved
+
+
+class ExampleIndex:
+    def __init__(self, indexDir):
+        with open(os.path.join(indexDir, "meta.json"), 'r',
+                  encoding='utf-8') as file:
+            meta = json.load(file)
+        if meta["version"] != INDEX_VERSION:
+            raise ValueError(f"Unknown index version {meta['version']} of "
+                             f"{indexDir}, build it again")
+        self.indexDir = indexDir
+        self.dims = meta["dims"]
+        self.idf = np.load(os.path.join(indexDir, "idf.npy"))
+        # loaded on first use; key = annotator
+        self.vectors = {}
+        self.examples = {}
+
+    def load(self, annotator):
+        if annotator not in self.vectors:
+            self.vectors[annotator] = sparse.load_npz(
+                os.path.join(self.indexDir, f"{annotator}.npz")).tocsr()
+            with open(os.path.join(self.indexDir, f"{annotator}.jsonl"), 'r',
+                      encoding='utf-8') as file:
+                self.examples[annotator] = [json.loads(line)
+                                            for line in file]
+        return self.vectors[annotator]
+
+    def vectorize(self, texts):
+        return weightMatrix(countMatrix(texts, self.dims), self.idf)
+
+    # positions of the examples with one of the ids or the same text; key =
+    # id or text
+    def keyPositions(self, annotator):
+        self.load(annotator)
+        positions = {}
+        for i, example in enumerate(self.examples[annotator]):
+            positions.setdefault(("id", example['id']), []).append(i)
+            positions.setdefault(("text", example['text']), []).append(i)
+        return positions
+
+    # positions of the n most similar examples of the annotator for every
+    # text, the most similar one last; batchSize texts are compared at once.
+    # Examples with the same text or one of the ids of the text (ids: one
+    # list per text) are never chosen, so a text can't be its own example
+    def nearest(self, annotator, texts, n, batchSize=256, ids=None):
+        vectors = self.load(annotator)
+        n = min(n, vectors.shape[0])
+        if n == 0:
+            return [[] for _ in texts]
+        known = self.keyPositions(annotator)
+        result = []
+        for start in range(0, len(texts), batchSize):
+            batch = texts[start:start + batchSize]
+            queries = self.vectorize(batch)
+            similarity = queries.dot(vectors.T).toarray()
+            for row, text in enumerate(batch):
+                keys = [("text", text)] + [
+                    ("id", key) for key in (ids[start + row] if ids else [])]
+                for key in keys:
+                    similarity[row, known.get(key, [])] = -np.inf
+            if n < similarity.shape[1]:
+                top = np.argpartition(-similarity, n - 1, axis=1)[:, :n]
+            else:
+                top = np.tile(np.arange(similarity.shape[1]),
+                              (similarity.shape[0], 1))
+            # ascending similarity, on equal similarity the earlier example
+            # is closer to the text
+            scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.lexsort((-top, scores))
+            top = np.take_along_axis(top, order, axis=1)
+            scores = np.take_along_axis(scores, order, axis=1)
+            # excluded examples are only in top with too few other examples
+            result.extend(positions[np.isfinite(rowScores)].tolist()
+                          for positions, rowScores in zip(top, scores))
+        return result
+
+    # examples of the annotator at the positions
+    def exampleList(self, annotator, positions):
+        self.load(annotator)
+        return [self.examples[annotator][i] for i in positions]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Index of the trainset for similar few shot examples')
+    parser.add_argument("--input", required=True,
+                        help='Trainset (.jsonl or .corpus folder)')
+    parser.add_argument("--index-dir",
+                        default="../../02_few_shot_examples/index")
+    parser.add_argument("--dims", type=int, default=2 ** 18,
+                        help='Number of hashed features')
+    parser.add_argument("--max-chars", type=int, default=150,
+                        help='Maximum text length of an example')
+    args = parser.parse_args()
+    saved = buildIndex(args.input, args.index_dir, args.dims,
+                       args.max_chars)
+    print(f"Indexed {sum(saved.values())} examples of {len(saved)} "
+          f"annotators in {args.index_dir}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# Latency of the HTTP requests of a backend, split into connect (DNS, TCP
+# and TLS handshake of a new connection, 0 if a pooled connection is reused),
+# time to first byte (request sent until the response headers) and total
+# (until the body is read). The numbers show how much of a call is handshake
+# overhead and how much is the model.
+# - traceConfig(): hooks for an aiohttp session
+# - TimedAdapter: requests adapter with a connection pool that measures the
+#   connect time
+# - LatencyStats: collects the timings, prints a summary and optionally logs
+#   every request as JSON line
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+import aiohttp
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class LatencyStats:
+    def __init__(self, logPath=None):
+        self.timings = []
+        self.log = open(logPath, 'a', encoding='utf-8') if logPath else None
+        self.lock = threading.Lock()
+
+    # seconds of one request
+    def add(self, connect, ttfb, total, newConnection):
+        timing = {"connect": round(connect, 4), "ttfb": round(ttfb, 4),
+                  "total": round(total, 4), "newConnection": newConnection}
+        with self.lock:
+            self.timings.append(timing)
+            if self.log:
+                self.log.write(json.dumps(timing) + '\n')
+
+    def summary(self):
+        if not self.timings:
+            return "No requests timed"
+        lines = [f"{len(self.timings)} requests, "
+                 f"{sum(t['newConnection'] for t in self.timings)} "
+                 "new connections"]
+        for field in ("connect", "ttfb", "total"):
+            values = sorted(t[field] for t in self.timings)
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            lines.append(f"{field:>8}: mean {statistics.mean(values):.4f}s "
+                         f"median {statistics.median(values):.4f}s "
+                         f"p95 {p95:.4f}s")
+        return "\n".join(lines)
+
+    def close(self):
+        print(self.summary())
+        if self.log:
+            self.log.close()
+            self.log = None
+
+
+# aiohttp hooks; the timings are written into the trace_request_ctx of the
+# request (see requestContext). The time to first byte starts when the
+# request has a connection, waiting for a free connection of the pool only
+# counts for the total
+def traceConfig():
+    async def onConnectionStart(session, context, params):
+        context.trace_request_ctx.connectStart = time.perf_counter()
+
+    async def onConnectionEnd(session, context, params):
+        timing = context.trace_request_ctx
+        timing.ready = time.perf_counter()
+        timing.connect = timing.ready - timing.connectStart
+        timing.newConnection = True
+
+    async def onConnectionReuse(session, context, params):
+        context.trace_request_ctx.ready = time.perf_counter()
+
+    # called as soon as the response headers are there
+    async def onRequestEnd(session, context, params):
+        timing = context.trace_request_ctx
+        timing.ttfb = time.perf_counter() - timing.ready
+
+    config = aiohttp.TraceConfig()
+    config.on_connection_create_start.append(onConnectionStart)
+    config.on_connection_create_end.append(onConnectionEnd)
+    config.on_connection_reuseconn.append(onConnectionReuse)
+    config.on_request_end.append(onRequestEnd)
+    return config
+
+
+# context for one request of an aiohttp session with traceConfig()
+def requestContext():
+    now = time.perf_counter()
+    return SimpleNamespace(start=now, ready=now, connect=0.0, ttfb=0.0,
+                           newConnection=False)
+
+
+# connect time of the requests of the current thread
+connectTimes = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        connectTimes.seconds = getattr(connectTimes, "seconds", 0.0) + \
+            time.perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        connectTimes.seconds = getattr(connectTimes, "seconds", 0.0) + \
+            time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+# requests adapter with keep-alive pool of poolSize connections per host
+class TimedAdapter(HTTPAdapter):
+    def __init__(self, poolSize=16):
+        super().__init__(pool_connections=1, pool_maxsize=poolSize,
+                         pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    # start the timing of a request in this thread; returns the start time
+    @staticmethod
+    def startTiming():
+        connectTimes.seconds = 0.0
+        return time.perf_counter()
+
+    # connect time of the last request in this thread
+    @staticmethod
+    def connectTime():
+        return getattr(connectTimes, "seconds", 0.0)
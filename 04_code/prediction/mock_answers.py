@@ -0,0 +1,85 @@
+# Answers of the mock API: a label derived from the text and annotator in
+# the format of the fireworks and openai chat completions. Used by
+# mock_server.py and by the FakeBackend (backends.py), which answers without
+# a server.
+
+# Date: October 17, 2026
+
+# import libraries
+import hashlib
+import json
+import re
+import time
+
+LABELS = ["0-Kein", "1-Gering", "2-Vorhanden", "3-Stark", "4-Extrem"]
+
+
+# same text and annotator always gets the same label
+def pickLabel(text, annotator):
+    digest = hashlib.md5(f"{annotator}|{text}".encode("utf-8")).digest()
+    return LABELS[digest[0] % len(LABELS)]
+
+
+# build the answer for the schema of the request; the zero shot schema
+# ("annotations") gets one entry per annotator named in the system prompt,
+# the few shot schema ("annotation") one entry per annotator of the examples
+# (maxItems). The schema is in response_format (fireworks) or in the function
+# (openai)
+def buildAnswer(payload):
+    messages = payload.get("messages", [])
+    text = messages[-1]["content"] if messages else ""
+    if payload.get("functions"):
+        schema = payload["functions"][0].get("parameters", {})
+    else:
+        schema = payload.get("response_format", {}).get("schema", {})
+    properties = schema.get("properties", {})
+    allMessages = " ".join(str(m.get("content", "")) for m in messages)
+    annotators = list(dict.fromkeys(re.findall(r"A\d{3}", allMessages)))
+
+    if "annotations" in properties:
+        if not annotators:
+            annotators = ["A001"]
+        return {"annotations": [
+            {"user": annotator, "label": pickLabel(text, annotator)}
+            for annotator in annotators]}
+
+    # several annotators in one request (MultiAnnotatorPrompt)
+    count = properties.get("annotation", {}).get("maxItems", 1)
+    annotators = annotators[:count] or ["A001"]
+    return {"annotation": [
+        {"user": annotator, "label": pickLabel(text, annotator)}
+        for annotator in annotators]}
+
+
+# response in the format of the fireworks API; openai answers with a
+# function call if the request has functions
+def buildResponse(payload):
+    answer = json.dumps(buildAnswer(payload), ensure_ascii=False)
+    promptTokens = sum(len(str(m.get("content", "")).split())
+                       for m in payload.get("messages", []))
+    completionTokens = len(answer.split())
+    if payload.get("functions"):
+        message = {"role": "assistant", "content": None,
+                   "function_call": {
+                       "name": payload["functions"][0].get("name", ""),
+                       "arguments": answer}}
+        finishReason = "function_call"
+    else:
+        message = {"role": "assistant", "content": answer}
+        finishReason = "stop"
+    return {
+        "id": "mock-" + hashlib.md5(answer.encode("utf-8")).hexdigest(),
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": finishReason
+        }],
+        "usage": {
+            "prompt_tokens": promptTokens,
+            "total_tokens": promptTokens + completionTokens,
+            "completion_tokens": completionTokens
+        }
+    }
@@ -0,0 +1,245 @@
+# This script starts a local stand-in for the fireworks chat completions API
+# and the openai chat completions, files and batch API. Every request is
+# answered in the same format as the API with a label derived from the text,
+# so the prediction scripts can be tested without an API key and without
+# costs. Files and batches are only kept in memory.
+# Start: python mock_server.py --port 8000 --latency 0.2 --fail-rate 0.1
+# URL for the prediction scripts:
+# fireworks: http://localhost:8000/inference/v1/chat/completions
+# openai: http://localhost:8000/v1
+
+# Date: October 17, 2026
+
+# import libraries
+import argparse
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from mock_answers import buildResponse
+
+CHAT_PATH = "/inference/v1/chat/completions"
+OPENAI_CHAT_PATH = "/v1/chat/completions"
+FILES_PATH = "/v1/files"
+BATCHES_PATH = "/v1/batches"
+
+
+# output file of a batch: one line per line of the input file
+def runBatch(inputFile):
+    lines = []
+    for number, line in enumerate(inputFile.splitlines()):
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        lines.append({
+            "id": f"batch_req_{number}",
+            "custom_id": request["custom_id"],
+            "response": {"status_code": 200,
+                         "request_id": f"req_{number}",
+                         "body": buildResponse(request["body"])},
+            "error": None
+        })
+    return "".join(json.dumps(line, ensure_ascii=False) + "\n"
+                   for line in lines).encode("utf-8")
+
+
+# files and batches of the openai API, only in memory
+class BatchStore:
+    def __init__(self):
+        self.files = {}
+        self.batches = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    # call with the lock held
+    def newFile(self, filename, purpose, content):
+        fileId = f"file-{next(self.ids)}"
+        self.files[fileId] = {
+            "object": {"id": fileId, "object": "file",
+                       "bytes": len(content),
+                       "created_at": int(time.time()),
+                       "filename": filename, "purpose": purpose,
+                       "status": "processed"},
+            "content": content}
+        return self.files[fileId]["object"]
+
+    def addFile(self, filename, purpose, content):
+        with self.lock:
+            return self.newFile(filename, purpose, content)
+
+    def addBatch(self, request):
+        with self.lock:
+            inputFileId = request.get("input_file_id")
+            if inputFileId not in self.files:
+                return None
+            batchId = f"batch_{next(self.ids)}"
+            self.batches[batchId] = {
+                "id": batchId, "object": "batch",
+                "endpoint": request.get("endpoint"),
+                "input_file_id": inputFileId,
+                "completion_window": request.get("completion_window"),
+                "created_at": int(time.time()),
+                "status": "validating",
+                "output_file_id": None, "error_file_id": None,
+                "request_counts": {"total": 0, "completed": 0, "failed": 0}}
+            return self.batches[batchId]
+
+    # every retrieve moves the batch one step on: validating -> in_progress
+    # -> completed
+    def pollBatch(self, batchId):
+        with self.lock:
+            batch = self.batches.get(batchId)
+            if batch is None or batch["status"] == "completed":
+                return batch
+            if batch["status"] == "validating":
+                batch["status"] = "in_progress"
+                return batch
+            output = runBatch(
+                self.files[batch["input_file_id"]]["content"].decode("utf-8"))
+            outputFile = self.newFile("batch_output.jsonl", "batch_output",
+                                      output)
+            count = output.count(b"\n")
+            batch.update({"status": "completed",
+                          "output_file_id": outputFile["id"],
+                          "completed_at": int(time.time()),
+                          "request_counts": {"total": count,
+                                             "completed": count,
+                                             "failed": 0}})
+            return batch
+
+
+# file and purpose of a multipart upload (files API)
+def parseUpload(contentType, body):
+    message = BytesParser().parsebytes(
+        b"Content-Type: " + contentType.encode("latin-1") + b"\r\n\r\n" +
+        body)
+    filename, purpose, content = "upload.jsonl", "", b""
+    for part in message.get_payload():
+        name = part.get_param("name", header="content-disposition")
+        if name == "file":
+            filename = part.get_filename() or filename
+            content = part.get_payload(decode=True)
+        elif name == "purpose":
+            purpose = part.get_payload(decode=True).decode("utf-8")
+    return filename, purpose, content
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    # share of chat requests that fail with 429, 503 or a closed connection
+    failRate = 0.0
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, without this the body waits
+    # for the delayed ACK of the client
+    disable_nagle_algorithm = True
+    store = BatchStore()
+
+    def sendJson(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendNotFound(self):
+        self.sendJson(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if self.path == FILES_PATH:
+            self.sendJson(200, self.store.addFile(
+                *parseUpload(self.headers.get("Content-Type", ""), body)))
+            return
+        if self.path not in (CHAT_PATH, OPENAI_CHAT_PATH, BATCHES_PATH):
+            self.sendNotFound()
+            return
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            self.sendJson(400, {"error": "Invalid JSON"})
+            return
+        if self.path == BATCHES_PATH:
+            batch = self.store.addBatch(payload)
+            if batch is None:
+                self.sendJson(400, {"error": "Unknown input_file_id"})
+            else:
+                self.sendJson(200, batch)
+            return
+        time.sleep(self.latency)
+        if random.random() < self.failRate:
+            self.sendFailure()
+            return
+        self.sendJson(200, buildResponse(payload))
+
+    # transient errors of a real API, to test the retries
+    def sendFailure(self):
+        failure = random.choice(["429", "503", "reset"])
+        if failure == "reset":
+            self.close_connection = True
+            return
+        body = json.dumps({"error": "Mock failure"}).encode("utf-8")
+        self.send_response(int(failure))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if failure == "429":
+            self.send_header("Retry-After", "0.1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith(BATCHES_PATH + "/"):
+            batch = self.store.pollBatch(self.path[len(BATCHES_PATH) + 1:])
+            if batch is None:
+                self.sendNotFound()
+            else:
+                self.sendJson(200, batch)
+            return
+        match = re.fullmatch(FILES_PATH + r"/([^/]+)/content", self.path)
+        if match is None or match.group(1) not in self.store.files:
+            self.sendNotFound()
+            return
+        content = self.store.files[match.group(1)]["content"]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Local mock of the fireworks and openai API')
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help='Seconds to wait before every answer')
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help='Share of chat requests that fail (429, 503 or '
+                        'closed connection)')
+    args = parser.parse_args()
+
+    MockHandler.latency = args.latency
+    MockHandler.failRate = args.fail_rate
+    # room for many connections opened at the same time
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(("localhost", args.port), MockHandler)
+    print(f"Mock server running on http://localhost:{args.port}{CHAT_PATH} "
+          f"and http://localhost:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# Prediction pipeline for all prompting methods and APIs. The backend
+# (backends.py) sends the requests, the prompt strategy (prompts.py) builds
+# them. Requests are sent concurrently (maxInFlight), limited by the rate
+# limiter, answered from the response cache if possible, retried on
+# transient errors (retry.py) and saved in the order of the corpus
+# (writers.py). Start it with predict.py.
+
+# Date: October 17, 2026
+
+# import libraries
+import asyncio
+import json
+import os
+import sys
+from backends import ResponseError
+from checkpoint import (checkpointPath, prepareResume, prepareTextResume,
+                        removeCheckpoint)
+from retry import RetryPolicy, classifyError
+from writers import OutputWriter
+
+# corpus_store.py (converted .corpus folders) is in the helper folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "helper"))
+from corpus_store import Corpus, is_corpus  # noqa: E402
+
+
+# loading the prompt for the api call
+def loadPrompt(promptPath):
+    prompt = None
+    if os.path.exists(promptPath):
+        with open(promptPath, "r", encoding="utf-8") as file:
+            prompt = file.read()
+    else:
+        print("Error Reading Prompt")
+    return prompt
+
+
+# load the data to classify (.jsonl file or .corpus folder)
+def loadCorpus(dataPath):
+    corpus_dict = {}
+    if is_corpus(dataPath):
+        corpus = Corpus(dataPath)
+        for i, (identifier, user_text) in enumerate(
+                zip(corpus.id_list(), corpus.text_list())):
+            annotators = corpus.annotators(i)
+            corpus_dict[identifier] = (user_text, ", ".join(annotators),
+                                       len(annotators))
+    elif os.path.exists(dataPath):
+        with open(dataPath, 'r', encoding='utf-8') as file:
+            for line in file:
+                entry = json.loads(line.strip())
+                identifier = entry["id"]
+                user_text = entry["text"]
+                # Handle different key names for annotators
+                if "annotations" in entry:
+                    element = entry["annotations"]
+                    annotators = [annotation["user"] for annotation in element]
+                elif "annotators" in entry:
+                    annotators = entry["annotators"]
+                else:
+                    annotators = []
+
+                annotator_count = len(annotators)
+                annotator_names = ", ".join(annotators)
+                corpus_dict[identifier] = (user_text, annotator_names,
+                                           annotator_count)
+    else:
+        print("Path didn't exist (loadCorpus)")
+    return corpus_dict
+
+
+# name of a request (annotators predicted together) in the checkpoint
+def unitName(annotators):
+    return ", ".join(annotators)
+
+
+# split the usage of a request evenly between its annotators; the remainder
+# goes to the first annotators so the shares add up to the usage
+def splitUsage(usage, annotators):
+    shares = [{} for _ in annotators]
+    for field in ('prompt_tokens', 'completion_tokens'):
+        part, rest = divmod(usage[field], len(annotators))
+        for number, share in enumerate(shares):
+            share[field] = part + (1 if number < rest else 0)
+    for share in shares:
+        share['total_tokens'] = share['prompt_tokens'] + \
+            share['completion_tokens']
+    return zip(annotators, shares)
+
+
+class Pipeline:
+    def __init__(self, backend, strategy, resultPath, resultTokensPath,
+                 errorPath, maxInFlight=16, rateLimiter=None,
+                 responseCache=None, retryPolicy=None, resume=False,
+                 checkpointEvery=100, verbose=False):
+        self.backend = backend
+        self.strategy = strategy
+        self.resultPath = resultPath
+        self.resultTokensPath = resultTokensPath
+        self.errorPath = errorPath
+        self.maxInFlight = maxInFlight
+        self.rateLimiter = rateLimiter
+        self.responseCache = responseCache
+        self.retryPolicy = retryPolicy or RetryPolicy()
+        self.resume = resume
+        # texts between two fsyncs of the output files
+        self.checkpointEvery = checkpointEvery
+        self.verbose = verbose
+        self.writer = None
+
+    # load the corpus, prepare the resume and open the output files
+    def open(self, dataPath):
+        corpus = loadCorpus(dataPath)
+        self.strategy.prepare(corpus)
+        doneIds, completed = set(), {}
+        if self.resume and self.strategy.resumePerText:
+            doneIds = prepareTextResume(self.resultPath,
+                                        self.resultTokensPath)
+        elif self.resume:
+            doneIds, completed = prepareResume(self.resultPath,
+                                               self.resultTokensPath, corpus,
+                                               self.strategy.units)
+        self.writer = OutputWriter(self.resultPath, self.resultTokensPath,
+                                   self.errorPath,
+                                   checkpointPath(self.resultPath),
+                                   verbose=self.verbose)
+
+        # texts still to predict: key -> (text, requests, done requests)
+        pending = {}
+        for key in corpus:
+            if key in doneIds:
+                continue
+            text = corpus[key][0]
+            annotators = corpus[key][1].split(", ") if corpus[key][1] else []
+            pending[key] = (text, self.strategy.units(annotators),
+                            completed.get(key, {}))
+        return pending
+
+    # read the answer out of a raw response; returns the annotations and the
+    # usage or None
+    def processResponse(self, key, annotators, response_data):
+        try:
+            json_answer, fin_reason, usage = \
+                self.backend.parseResponse(response_data)
+        except ResponseError as e:
+            print(f"Error at {key}: {e}")
+            self.writer.writeError(key, "response", str(e),
+                                   annotators=unitName(annotators))
+            return None
+
+        if fin_reason not in ["function_call", "stop"]:
+            self.writer.writeError(key, "finish_reason",
+                                   "Finish reason error",
+                                   annotators=unitName(annotators),
+                                   finishReason=fin_reason)
+            print(f"Error at {key}: Finish reason error")
+        return self.strategy.extract(json_answer, annotators), usage
+
+    # save the results of one text; results contains the new result (or
+    # None) per request, answered the requests of an earlier run
+    def saveText(self, key, text, units, answered, results):
+        answerList = []
+        for unit in units:
+            name = unitName(unit)
+            if name in answered:
+                answerList.append(answered[name])
+                continue
+            if results.get(name) is None:
+                continue
+            annotations, usage = results[name]
+            if annotations:
+                self.writer.saveCheckpoint(key, name, annotations)
+            answerList.append(annotations)
+            if not self.strategy.perAnnotatorTokens:
+                self.writer.saveTokens(usage['prompt_tokens'],
+                                       usage['total_tokens'],
+                                       usage['completion_tokens'], key, text)
+                continue
+            for annotator, share in splitUsage(usage, unit):
+                self.writer.saveTokens(share['prompt_tokens'],
+                                       share['total_tokens'],
+                                       share['completion_tokens'], key, text,
+                                       annotator=annotator)
+        self.writer.saveResponse(answerList, key, text)
+
+    # send a request with retries; every attempt goes through the rate
+    # limiter. Returns the response and the reserved tokens
+    async def send(self, key, annotators, request):
+        reserved = 0
+
+        async def attempt():
+            nonlocal reserved
+            reserved = await self.rateLimiter.acquireAsync() \
+                if self.rateLimiter else 0
+            try:
+                return await self.backend.send(request)
+            except Exception:
+                if self.rateLimiter:
+                    self.rateLimiter.release(reserved)
+                raise
+
+        def onRetry(error, attempt, wait):
+            _, status, _ = classifyError(error)
+            self.writer.writeError(key, "retry",
+                                   str(error) or type(error).__name__,
+                                   annotators=unitName(annotators),
+                                   status=status, attempt=attempt,
+                                   wait=round(wait, 2))
+
+        return await self.retryPolicy.call(attempt, onRetry), reserved
+
+    # one request; the semaphore limits the requests in flight, the request
+    # is only built once a slot is free to keep the memory low.
+    # Returns the annotations and the usage or None
+    async def predictUnit(self, semaphore, key, text, annotators):
+        async with semaphore:
+            request = self.backend.buildRequest(
+                self.strategy.messages(text, annotators),
+                self.strategy.schema(annotators))
+            # same request as in an earlier run: use the saved response
+            cached = self.responseCache.get(request) \
+                if self.responseCache else None
+            if cached is not None:
+                return self.processResponse(key, annotators, cached)
+            try:
+                response_data, reserved = await self.send(key, annotators,
+                                                          request)
+            except Exception as e:
+                # terminal error or no retries left; a run with resume sends
+                # the request again
+                retryable, status, _ = classifyError(e)
+                message = str(e) or type(e).__name__
+                print(f"ERROR at {key}: {message}")
+                self.writer.writeError(key, "request", message,
+                                       annotators=unitName(annotators),
+                                       status=status, retryable=retryable)
+                return None
+
+        result = self.processResponse(key, annotators, response_data)
+        if result is not None:
+            if self.rateLimiter:
+                self.rateLimiter.record(result[1]['total_tokens'], reserved)
+            if self.responseCache:
+                self.responseCache.put(request, response_data)
+        elif self.rateLimiter:
+            # unusable answer: the usage is unknown, give the tokens back
+            self.rateLimiter.release(reserved)
+        return result
+
+    # fan out the missing requests of one text; returns the result per
+    # request
+    async def predictText(self, semaphore, key, text, units, answered):
+        missing = [unit for unit in units if unitName(unit) not in answered]
+        results = await asyncio.gather(*[
+            self.predictUnit(semaphore, key, text, unit)
+            for unit in missing])
+        return {unitName(unit): result
+                for unit, result in zip(missing, results)}
+
+    # predict the corpus; the results are saved in the order of the corpus.
+    # With resume the texts and requests already saved in result.jsonl or
+    # the checkpoint are skipped
+    async def run(self, dataPath):
+        pending = self.open(dataPath)
+        semaphore = asyncio.Semaphore(self.maxInFlight)
+        tasks = {
+            key: asyncio.create_task(self.predictText(
+                semaphore, key, text, units, answered))
+            for key, (text, units, answered) in pending.items()
+        }
+
+        try:
+            for done, (key, task) in enumerate(tasks.items(), start=1):
+                results = await task
+                self.saveText(key, *pending[key], results)
+                if done % self.checkpointEvery == 0:
+                    self.writer.checkpoint()
+                    print(f"{done}/{len(tasks)} texts done")
+        finally:
+            # stop the open requests if the run is aborted
+            for task in tasks.values():
+                task.cancel()
+            await self.backend.close()
+            self.writer.close()
+        removeCheckpoint(self.resultPath)
+
+
+# run the pipeline for a corpus
+def modelCall(backend, strategy, dataPath, resultPath, resultTokensPath,
+              errorPath, **options):
+    pipeline = Pipeline(backend, strategy, resultPath, resultTokensPath,
+                        errorPath, **options)
+    asyncio.run(pipeline.run(dataPath))
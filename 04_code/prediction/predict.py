@@ -0,0 +1,196 @@
+# This script starts the prediction for all prompting methods (zero shot,
+# few shot, few shot with summary guidelines, few shot with several
+# annotators per request, few shot with the most similar examples of the
+# trainset) with fireworks (Mixtral) or openai (GPT). Add own
+# API keys in config.py
+# Examples:
+#   python predict.py --backend fireworks --strategy few-shot --n-shot 10 \
+#       --model accounts/fireworks/models/mixtral-8x22b-instruct \
+#       --data ../../01_data/[dataset_name].jsonl \
+#       --output-dir ../../03_input/input_fireworks/10_shot_mixtral_8x22B
+#   python predict.py --backend openai --strategy few-shot \
+#       --data ../../01_data/[dataset_name].jsonl \
+#       --output-dir ../../03_input/input_openai/5_shot_gpt_4o_mini
+#   python predict.py --backend openai --strategy few-shot --batch ...
+#       (openai batch API, cheaper but answered within 24h, see batch.py)
+#   python predict.py --backend fireworks --strategy few-shot-retrieval \
+#       --index-dir ../../02_few_shot_examples/index ...
+#       (index built with example_index.py)
+# The prompt is read from basic_prompt.txt in the output dir; the results are
+# saved in result.jsonl, result_token.jsonl and errors.jsonl there.
+
+# Date: October 17, 2026
+
+# import libraries
+import argparse
+import os
+import sys
+from backends import (FakeBackend, FireworksBackend, OpenAIBackend,
+                      SyncFireworksBackend)
+from batch import batchCall
+from http_timing import LatencyStats
+from pipeline import loadPrompt, modelCall
+from prompts import (FewShotPrompt, MultiAnnotatorPrompt,
+                     RetrievalFewShotPrompt, ZeroShotPrompt)
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from retry import RetryPolicy
+
+# the summary guidelines are the system prompt of a few shot run
+STRATEGIES = {
+    "zero-shot": ZeroShotPrompt,
+    "few-shot": FewShotPrompt,
+    "summary-guidelines": FewShotPrompt,
+    "few-shot-multi": MultiAnnotatorPrompt,
+    "few-shot-retrieval": RetrievalFewShotPrompt,
+}
+
+
+def parseArguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Predict sexism labels with LLMs')
+    parser.add_argument("--backend", required=True,
+                        choices=["fireworks", "fireworks-sync", "openai",
+                                 "fake"])
+    parser.add_argument("--strategy", required=True,
+                        choices=list(STRATEGIES))
+    parser.add_argument("--data", required=True,
+                        help='Corpus (.jsonl) with the texts to predict')
+    parser.add_argument("--output-dir", required=True,
+                        help='Folder for result.jsonl, result_token.jsonl '
+                        'and errors.jsonl')
+    parser.add_argument("--prompt",
+                        help='Prompt file, default: '
+                        '[output-dir]/basic_prompt.txt')
+    parser.add_argument("--model", help='Model name of the API')
+    parser.add_argument("--n-shot", type=int, default=5,
+                        help='Examples per annotator (few shot)')
+    parser.add_argument("--examples-dir",
+                        help='Folder with [annotator].jsonl examples, '
+                        'default: ../../02_few_shot_examples/[n]_shot_examples')  # noqa: E501
+    parser.add_argument("--index-dir",
+                        help='Index of the trainset (example_index.py) for '
+                        'few-shot-retrieval, default: '
+                        '../../02_few_shot_examples/index')
+    parser.add_argument("--annotators-per-request", type=int, default=0,
+                        help='Annotators in one request (few-shot-multi), '
+                        '0 = all annotators of the text')
+    parser.add_argument("--api-url",
+                        help='Other URL of the API, e.g. of mock_server.py')
+    parser.add_argument("--max-in-flight", type=int, default=16,
+                        help='Requests sent at the same time')
+    parser.add_argument("--pool-size", type=int,
+                        help='Keep-alive connections of the fireworks '
+                        'backends, default: --max-in-flight')
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help='Seconds per request (fireworks)')
+    parser.add_argument("--connect-timeout", type=float, default=10.0,
+                        help='Seconds to open a connection (fireworks)')
+    parser.add_argument("--keep-alive", type=float, default=30.0,
+                        help='Seconds an idle connection stays open '
+                        '(fireworks async)')
+    parser.add_argument("--timing", action='store_true',
+                        help='Print connect, first byte and total latency '
+                        'of the requests (fireworks)')
+    parser.add_argument("--timing-log",
+                        help='JSONL file for the latency of every request')
+    parser.add_argument("--rpm", type=int,
+                        help='Requests per minute of the account')
+    parser.add_argument("--tpm", type=int,
+                        help='Tokens per minute of the account')
+    parser.add_argument("--max-attempts", type=int, default=5,
+                        help='Attempts per request for transient errors '
+                        '(429, 5xx, timeouts)')
+    parser.add_argument("--retry-base-delay", type=float, default=1.0,
+                        help='Seconds of the first backoff, doubled per retry')
+    parser.add_argument("--retry-max-delay", type=float, default=60.0)
+    parser.add_argument("--cache",
+                        help='SQLite file to reuse responses of earlier runs')
+    parser.add_argument("--cache-size-mb", type=int, default=1024)
+    parser.add_argument("--resume", action='store_true',
+                        help='Skip texts and annotators already saved')
+    parser.add_argument("--batch", action='store_true',
+                        help='Send all requests with the openai batch API')
+    parser.add_argument("--batch-poll-interval", type=float, default=60.0,
+                        help='Seconds between two status checks of a batch')
+    parser.add_argument("--verbose", action='store_true',
+                        help='Print every saved result')
+    parser.add_argument("--fake-latency", type=float, default=0.0,
+                        help='Seconds per request of the fake backend')
+    return parser.parse_args(argv)
+
+
+def makeBackend(args):
+    if args.backend in ("fireworks", "fireworks-sync"):
+        backend = FireworksBackend if args.backend == "fireworks" \
+            else SyncFireworksBackend
+        stats = None
+        if args.timing or args.timing_log:
+            stats = LatencyStats(args.timing_log)
+        return backend(model=args.model, url=args.api_url,
+                       maxConnections=args.pool_size or args.max_in_flight,
+                       timeout=args.timeout,
+                       connectTimeout=args.connect_timeout,
+                       keepAlive=args.keep_alive, stats=stats)
+    if args.backend == "openai":
+        return OpenAIBackend(model=args.model, baseUrl=args.api_url)
+    return FakeBackend(model=args.model, latency=args.fake_latency)
+
+
+def makeStrategy(args, prompt):
+    if args.strategy == "zero-shot":
+        return ZeroShotPrompt(prompt)
+    if args.strategy == "few-shot-multi":
+        return MultiAnnotatorPrompt(prompt, n_shot=args.n_shot,
+                                    examplesDir=args.examples_dir,
+                                    groupSize=args.annotators_per_request)
+    if args.strategy == "few-shot-retrieval":
+        return RetrievalFewShotPrompt(prompt, n_shot=args.n_shot,
+                                      indexDir=args.index_dir)
+    return STRATEGIES[args.strategy](prompt, n_shot=args.n_shot,
+                                     examplesDir=args.examples_dir)
+
+
+def main(argv=None):
+    args = parseArguments(argv)
+    if args.batch and args.backend != "openai":
+        print("--batch only works with --backend openai")
+        return 1
+    promptPath = args.prompt or os.path.join(args.output_dir,
+                                             "basic_prompt.txt")
+    prompt = loadPrompt(promptPath)
+    if prompt is None:
+        return 1
+
+    rateLimiter = None
+    if args.rpm or args.tpm:
+        rateLimiter = RateLimiter(requestsPerMinute=args.rpm,
+                                  tokensPerMinute=args.tpm)
+    responseCache = None
+    if args.cache:
+        responseCache = ResponseCache(args.cache,
+                                      maxBytes=args.cache_size_mb * 1024 ** 2)
+
+    paths = (os.path.join(args.output_dir, "result.jsonl"),
+             os.path.join(args.output_dir, "result_token.jsonl"),
+             os.path.join(args.output_dir, "errors.jsonl"))
+    if args.batch:
+        batchCall(makeBackend(args), makeStrategy(args, prompt), args.data,
+                  *paths, pollInterval=args.batch_poll_interval,
+                  responseCache=responseCache, resume=args.resume,
+                  verbose=args.verbose)
+    else:
+        modelCall(makeBackend(args), makeStrategy(args, prompt), args.data,
+                  *paths, maxInFlight=args.max_in_flight,
+                  rateLimiter=rateLimiter, responseCache=responseCache,
+                  retryPolicy=RetryPolicy(args.max_attempts,
+                                          args.retry_base_delay,
+                                          args.retry_max_delay),
+                  resume=args.resume, verbose=args.verbose)
+
+    if responseCache:
+        responseCache.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
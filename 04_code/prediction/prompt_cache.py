@@ -0,0 +1,102 @@
+# Cache for the few shot prompts. The system message and the example turns
+# of every annotator are built once at startup, a request is then only the
+# cached prefix plus the text to predict. For requests with several
+# annotators the examples of every annotator are cached as one text block.
+# With examples chosen per text only the example turns are built per request.
+# The messages in the cache are shared between all requests, don't change
+# them in place.
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+
+# instruction appended to every example and every text to predict
+INSTRUCTION = "\n Klassifiziere diesen Text auf Sexismus und Frauenfeindlichkeit. Gib *genau* ein Label als Antwort"  # noqa: E501
+# instruction for a request with several annotators, placeholder: names
+MULTI_INSTRUCTION = "\n Klassifiziere diesen Text auf Sexismus und Frauenfeindlichkeit für jeden dieser Annotatoren: {}. Gib *genau* ein Label pro Annotator als Antwort"  # noqa: E501
+
+
+# load the first n_shot examples of an annotator; examplesDir contains one
+# {annotator}.jsonl per annotator
+def loadExamples(annotator, n_shot, examplesDir):
+    examplesJson = os.path.join(examplesDir, f'{annotator}.jsonl')
+    examples = []
+    with open(examplesJson, 'r', encoding='utf-8') as file:
+        for line in file:
+            if len(examples) == n_shot:
+                break
+            examples.append(json.loads(line))
+    return examples
+
+
+# system message and example turns for one annotator
+def buildPrefix(prompt, examples):
+    message = [{'role': 'system', 'content': prompt}]
+    for data in examples:
+        exampleText = data["text"] + INSTRUCTION
+        exampleResponse = data["annotations"]
+        message.append({'role': 'user', 'content': exampleText})
+        message.append({'role': 'assistant',
+                        'content': str(exampleResponse)})
+    return message
+
+
+# build the prefixes for all annotators; key = annotator
+def buildPromptCache(prompt, annotators, n_shot, examplesDir):
+    return {annotator: buildPrefix(prompt, loadExamples(annotator, n_shot,
+                                                        examplesDir))
+            for annotator in annotators}
+
+
+# all annotators of the corpus (see loadCorpus in the prediction scripts)
+def corpusAnnotators(corpus):
+    annotators = set()
+    for singleEntryWithData in corpus.values():
+        if singleEntryWithData[1]:
+            annotators.update(singleEntryWithData[1].split(", "))
+    return sorted(annotators)
+
+
+# complete message for one request
+def generateMessage(promptCache, annotator, text):
+    return promptCache[annotator] + [{'role': 'user',
+                                      'content': text + INSTRUCTION}]
+
+
+# complete message for one request with examples chosen for the text (see
+# example_index.py), built per request instead of cached
+def generateRetrievalMessage(prompt, examples, text):
+    return buildPrefix(prompt, examples) + [{'role': 'user',
+                                             'content': text + INSTRUCTION}]
+
+
+# examples of one annotator as one text block, for requests with several
+# annotators
+def buildExampleBlock(annotator, examples):
+    lines = [f"Beispiele von Annotator {annotator}:"]
+    for data in examples:
+        lines.append("Text: " + data["text"])
+        lines.append("Antwort: " + str(data["annotations"]))
+    return "\n".join(lines)
+
+
+# build the example blocks for all annotators; key = annotator
+def buildBlockCache(annotators, n_shot, examplesDir):
+    return {annotator: buildExampleBlock(annotator,
+                                         loadExamples(annotator, n_shot,
+                                                      examplesDir))
+            for annotator in annotators}
+
+
+# complete message for one request with several annotators: system prompt,
+# the example blocks of the annotators and the text
+def generateMultiMessage(prompt, blockCache, annotators, text):
+    blocks = "\n\n".join(blockCache[annotator] for annotator in annotators)
+    return [
+        {'role': 'system', 'content': prompt},
+        {'role': 'user', 'content': blocks},
+        {'role': 'user',
+         'content': text + MULTI_INSTRUCTION.format(", ".join(annotators))}
+    ]
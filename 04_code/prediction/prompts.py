@@ -0,0 +1,223 @@
+# Prompt strategies for the prediction pipeline. A strategy decides which
+# annotators are predicted together in one request, builds the messages and
+# the JSON schema of the answer and extracts the annotations from the answer.
+# - ZeroShotPrompt: one request per text for all annotators
+# - FewShotPrompt: one request per annotator with n examples of the annotator
+# - MultiAnnotatorPrompt: one request for several annotators with the n
+#   examples of each of them, fewer requests but a longer prompt
+# - RetrievalFewShotPrompt: like FewShotPrompt, but the n examples of the
+#   annotator that are most similar to the text (see example_index.py)
+# For the summary guidelines runs the guidelines are the system prompt of a
+# few shot run (see 03_input/*/5_shot_summary_guidelines_*/basic_prompt.txt).
+
+# Date: October 17, 2026
+
+# import libraries
+from pydantic import BaseModel, Field, ValidationError
+from example_index import ExampleIndex
+from prompt_cache import (buildBlockCache, buildPromptCache, corpusAnnotators,
+                          generateMessage, generateMultiMessage,
+                          generateRetrievalMessage)
+
+LABELS = ["0-Kein", "1-Gering", "2-Vorhanden", "3-Stark", "4-Extrem"]
+
+
+# Model for the response so every output looks the same
+class Annotation(BaseModel):
+    user: str = Field(..., description="Ein Kennzeichner für den Annotator.")
+    label: str = Field(
+        ...,
+        description="Das vergebene Label des Annotators für den Text.",
+        enum=LABELS
+    )
+
+
+class ZeroShotPrompt:
+    # the usage of a request is saved once for all annotators of the request
+    perAnnotatorTokens = False
+    # one request per text: on resume a text with annotations is done
+    resumePerText = True
+
+    # prompt with two placeholders: amount and names of the annotators
+    def __init__(self, prompt):
+        self.prompt = prompt
+
+    def prepare(self, corpus):
+        pass
+
+    # annotators predicted together in one request
+    def units(self, annotators):
+        return [tuple(annotators)]
+
+    def messages(self, text, annotators):
+        extended_prompt = self.prompt.format(len(annotators),
+                                             ", ".join(annotators))
+        return [
+            {"role": "system", "content": extended_prompt},
+            {"role": "user", "content": text}
+        ]
+
+    # json schema for the response
+    def schema(self, annotators):
+        return {
+            "type": "object",
+            "properties": {
+                "annotations": {
+                    "type": "array",
+                    "minItems": 4,
+                    "items": Annotation.model_json_schema()
+                }
+            },
+            "required": ["annotations"]
+        }
+
+    # annotations of one model answer
+    def extract(self, json_answer, annotators):
+        if isinstance(json_answer, dict):
+            return json_answer.get("annotations") or []
+        return []
+
+
+class FewShotPrompt:
+    # the usage of a request is saved per annotator (see Pipeline.saveText)
+    perAnnotatorTokens = True
+    # on resume only the missing annotators of a text are sent again
+    resumePerText = False
+
+    # examplesDir contains one {annotator}.jsonl with examples per annotator
+    # (see 02_few_shot_examples)
+    def __init__(self, prompt, n_shot=5, examplesDir=None):
+        self.prompt = prompt
+        self.n_shot = n_shot
+        if examplesDir is None:
+            examplesDir = f"../../02_few_shot_examples/{n_shot}_shot_examples"
+        self.examplesDir = examplesDir
+        self.promptCache = {}
+
+    # system message and examples are only loaded once per annotator
+    def prepare(self, corpus):
+        self.promptCache = buildPromptCache(self.prompt,
+                                            corpusAnnotators(corpus),
+                                            self.n_shot, self.examplesDir)
+
+    def units(self, annotators):
+        return [(annotator,) for annotator in annotators]
+
+    def messages(self, text, annotators):
+        return generateMessage(self.promptCache, annotators[0], text)
+
+    def schema(self, annotators):
+        return {
+            "type": "object",
+            "properties": {
+                "annotation": {
+                    "type": "array",
+                    "maxItems": 1,
+                    "minItems": 1,
+                    "uniqueItems": True,
+                    "items": Annotation.model_json_schema()
+                }
+            },
+            "required": ["annotation"]
+        }
+
+    # only the first annotation is used; the answer can also be the list
+    # itself if the model imitated the examples
+    def extract(self, json_answer, annotators):
+        if isinstance(json_answer, dict):
+            json_answer = json_answer.get("annotation")
+        if isinstance(json_answer, list) and len(json_answer) > 0:
+            return json_answer[:1]
+        return []
+
+
+class RetrievalFewShotPrompt(FewShotPrompt):
+    # indexDir: index of the trainset built with example_index.py
+    def __init__(self, prompt, n_shot=5, indexDir=None, batchSize=256):
+        super().__init__(prompt, n_shot=n_shot)
+        if indexDir is None:
+            indexDir = "../../02_few_shot_examples/index"
+        self.indexDir = indexDir
+        self.batchSize = batchSize
+        self.index = None
+        # positions of the examples in the index; key = (annotator, text)
+        self.selected = {}
+
+    # the examples of all texts of an annotator are searched at once
+    def prepare(self, corpus):
+        self.index = ExampleIndex(self.indexDir)
+        # ids of every text per annotator; examples with the same id or
+        # text are left out (the text itself in the trainset)
+        textsByAnnotator = {}
+        for key, (text, names, _) in corpus.items():
+            for annotator in names.split(", ") if names else []:
+                textsByAnnotator.setdefault(annotator, {}).setdefault(
+                    text, []).append(key)
+        self.selected = {}
+        for annotator, texts in textsByAnnotator.items():
+            for text, positions in zip(texts, self.index.nearest(
+                    annotator, list(texts), self.n_shot, self.batchSize,
+                    ids=list(texts.values()))):
+                self.selected[(annotator, text)] = positions
+
+    def messages(self, text, annotators):
+        annotator = annotators[0]
+        examples = self.index.exampleList(annotator,
+                                          self.selected[(annotator, text)])
+        return generateRetrievalMessage(self.prompt, examples, text)
+
+
+class MultiAnnotatorPrompt(FewShotPrompt):
+    # groupSize: annotators per request, 0 = all annotators of the text
+    def __init__(self, prompt, n_shot=5, examplesDir=None, groupSize=0):
+        super().__init__(prompt, n_shot=n_shot, examplesDir=examplesDir)
+        self.groupSize = groupSize
+        self.blockCache = {}
+
+    def prepare(self, corpus):
+        self.blockCache = buildBlockCache(corpusAnnotators(corpus),
+                                          self.n_shot, self.examplesDir)
+
+    def units(self, annotators):
+        size = self.groupSize or len(annotators) or 1
+        return [tuple(annotators[i:i + size])
+                for i in range(0, len(annotators), size)]
+
+    def messages(self, text, annotators):
+        return generateMultiMessage(self.prompt, self.blockCache, annotators,
+                                    text)
+
+    def schema(self, annotators):
+        return {
+            "type": "object",
+            "properties": {
+                "annotation": {
+                    "type": "array",
+                    "maxItems": len(annotators),
+                    "minItems": len(annotators),
+                    "uniqueItems": True,
+                    "items": Annotation.model_json_schema()
+                }
+            },
+            "required": ["annotation"]
+        }
+
+    # entries that don't match the Annotation schema (or the labels) or an
+    # annotator of the request are dropped, only the first entry per
+    # annotator is used
+    def extract(self, json_answer, annotators):
+        if isinstance(json_answer, dict):
+            json_answer = json_answer.get("annotation")
+        if not isinstance(json_answer, list):
+            return []
+        found = {}
+        for entry in json_answer:
+            try:
+                annotation = Annotation.model_validate(entry)
+            except ValidationError:
+                continue
+            if annotation.user in annotators and \
+                    annotation.label in LABELS:
+                found.setdefault(annotation.user, annotation.model_dump())
+        return [found[annotator] for annotator in annotators
+                if annotator in found]
@@ -0,0 +1,103 @@
+# Token bucket rate limiter for the prediction scripts. Keeps the requests
+# and the tokens per minute below the limits of the API account, so a run
+# uses the allowed quota without getting 429 (too many requests) errors.
+# Usage:
+#   rateLimiter = RateLimiter(requestsPerMinute=600, tokensPerMinute=200000)
+#   reserved = rateLimiter.acquire()  # or: await rateLimiter.acquireAsync()
+#   ... send the request ...
+#   rateLimiter.record(usage['total_tokens'], reserved)
+
+# Date: October 17, 2026
+
+# import libraries
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    # requestsPerMinute/tokensPerMinute = None means no limit.
+    # expectedTokens is the first guess for the tokens of a request, later it
+    # follows the usage reported by the API
+    def __init__(self, requestsPerMinute=None, tokensPerMinute=None,
+                 expectedTokens=1000):
+        self.requestsPerMinute = requestsPerMinute
+        self.tokensPerMinute = tokensPerMinute
+        self.expectedTokens = expectedTokens
+        # buckets start full, so a run can start with a burst
+        self.requestLevel = requestsPerMinute or 0
+        self.tokenLevel = tokensPerMinute or 0
+        self.lastRefill = time.monotonic()
+        self.lock = threading.Lock()
+
+    # fill the buckets with the amount allowed since the last refill
+    def refill(self, now):
+        elapsed = now - self.lastRefill
+        self.lastRefill = now
+        if self.requestsPerMinute:
+            self.requestLevel = min(
+                self.requestsPerMinute,
+                self.requestLevel + elapsed * self.requestsPerMinute / 60)
+        if self.tokensPerMinute:
+            self.tokenLevel = min(
+                self.tokensPerMinute,
+                self.tokenLevel + elapsed * self.tokensPerMinute / 60)
+
+    # try to take one request and the expected tokens out of the buckets;
+    # returns (0, reserved tokens) on success or (seconds to wait, 0)
+    def reserve(self):
+        with self.lock:
+            self.refill(time.monotonic())
+            tokens = self.expectedTokens
+            if self.tokensPerMinute:
+                # a single request may never need more than a full bucket
+                tokens = min(tokens, self.tokensPerMinute)
+
+            wait = 0.0
+            if self.requestsPerMinute and self.requestLevel < 1:
+                wait = max(wait, (1 - self.requestLevel) * 60 /
+                           self.requestsPerMinute)
+            if self.tokensPerMinute and self.tokenLevel < tokens:
+                wait = max(wait, (tokens - self.tokenLevel) * 60 /
+                           self.tokensPerMinute)
+            if wait > 0:
+                return wait, 0
+
+            if self.requestsPerMinute:
+                self.requestLevel -= 1
+            if self.tokensPerMinute:
+                self.tokenLevel -= tokens
+            return 0, tokens
+
+    # blocks until a request is allowed; returns the reserved tokens
+    def acquire(self):
+        while True:
+            wait, reserved = self.reserve()
+            if wait == 0:
+                return reserved
+            time.sleep(wait)
+
+    # same as acquire for asyncio code
+    async def acquireAsync(self):
+        while True:
+            wait, reserved = self.reserve()
+            if wait == 0:
+                return reserved
+            await asyncio.sleep(wait)
+
+    # correct the token bucket with the real usage of the request (from the
+    # usage block of the response) and adjust the guess for the next requests
+    def record(self, totalTokens, reserved):
+        with self.lock:
+            if self.tokensPerMinute:
+                self.tokenLevel -= totalTokens - reserved
+            self.expectedTokens = round(
+                0.8 * self.expectedTokens + 0.2 * totalTokens)
+
+    # give the reserved tokens back if the request failed; the request
+    # itself still counts
+    def release(self, reserved):
+        with self.lock:
+            if self.tokensPerMinute:
+                self.tokenLevel = min(self.tokensPerMinute,
+                                      self.tokenLevel + reserved)
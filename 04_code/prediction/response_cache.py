@@ -0,0 +1,96 @@
+# Persistent cache for the API responses. The key is a hash over the complete
+# request (model, messages, schema and sampling parameters), so a request is
+# only sent again if something in the request changed. Only useful for
+# requests with temperature 0, otherwise a new answer is expected anyway.
+# The responses are stored in a SQLite file; if the file gets bigger than
+# maxBytes the least recently used responses are removed.
+
+# Date: October 17, 2026
+
+# import libraries
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+# hash over the complete request
+def requestKey(payload):
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, cachePath, maxBytes=1024 ** 3):
+        self.maxBytes = maxBytes
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(cachePath, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "size INTEGER NOT NULL, lastUsed REAL NOT NULL)")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS responsesLastUsed "
+            "ON responses (lastUsed)")
+        self.connection.commit()
+        self.size = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    # cached response for the request or None
+    def get(self, payload):
+        key = requestKey(payload)
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT response FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE responses SET lastUsed = ? WHERE key = ?",
+                (time.time(), key))
+            self.connection.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    # save the response (json serializable) for the request
+    def put(self, payload, response):
+        key = requestKey(payload)
+        data = json.dumps(response, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        with self.lock:
+            old = self.connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self.size -= old[0]
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time()))
+            self.size += size
+            if self.size > self.maxBytes:
+                self.evict()
+            self.connection.commit()
+
+    # remove the least recently used responses until the cache is at 90% of
+    # maxBytes; lock has to be held by the caller
+    def evict(self):
+        target = self.maxBytes * 0.9
+        rows = self.connection.execute(
+            "SELECT key, size FROM responses ORDER BY lastUsed")
+        removeKeys = []
+        for key, size in rows:
+            if self.size <= target:
+                break
+            removeKeys.append((key,))
+            self.size -= size
+        self.connection.executemany(
+            "DELETE FROM responses WHERE key = ?", removeKeys)
+
+    def close(self):
+        print(f"Response cache: {self.hits} hits, {self.misses} misses")
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,88 @@
+# Retries for the requests of the prediction pipeline. Failures are sorted
+# into retryable (429, 5xx, timeouts, connection errors) and terminal ones
+# (other 4xx, errors in our code). Retryable requests are sent again after a
+# jittered exponential backoff ("full jitter"); a Retry-After header of the
+# API is honored.
+# Usage:
+#   retryPolicy = RetryPolicy(maxAttempts=5)
+#   response = await retryPolicy.call(lambda: backend.send(request))
+
+# Date: October 17, 2026
+
+# import libraries
+import asyncio
+import random
+import aiohttp
+import openai
+import requests
+
+RETRY_STATUS = {408, 409, 429}
+
+
+# HTTP error status of an API
+class StatusError(Exception):
+    def __init__(self, status, message="", retryAfter=None):
+        super().__init__(f"HTTP {status}: {message}"[:500])
+        self.status = status
+        self.retryAfter = retryAfter
+
+
+# seconds of a Retry-After header; None if missing or a date
+def parseRetryAfter(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# returns (retryable, HTTP status or None, Retry-After in seconds or None)
+def classifyError(error):
+    if isinstance(error, StatusError):
+        status = error.status
+        return (status in RETRY_STATUS or status >= 500, status,
+                error.retryAfter)
+    if isinstance(error, openai.APIStatusError):
+        status = error.status_code
+        retryAfter = parseRetryAfter(error.response.headers.get("retry-after"))
+        return status in RETRY_STATUS or status >= 500, status, retryAfter
+    # openai.APITimeoutError is an APIConnectionError
+    if isinstance(error, (openai.APIConnectionError, aiohttp.ClientError,
+                          asyncio.TimeoutError, ConnectionError,
+                          requests.ConnectionError, requests.Timeout,
+                          requests.exceptions.ChunkedEncodingError)):
+        return True, None, None
+    return False, None, None
+
+
+class RetryPolicy:
+    # maxAttempts counts the first try; delays in seconds
+    def __init__(self, maxAttempts=5, baseDelay=1.0, maxDelay=60.0):
+        self.maxAttempts = maxAttempts
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+
+    # seconds to wait before the next attempt (attempt starts at 1)
+    def delay(self, attempt, retryAfter=None):
+        backoff = random.uniform(0, min(self.maxDelay,
+                                        self.baseDelay * 2 ** (attempt - 1)))
+        if retryAfter is not None:
+            return max(retryAfter, backoff)
+        return backoff
+
+    # await send() until it works; onRetry(error, attempt, wait) is called
+    # before every new attempt. Raises the last error if the request fails
+    # terminally or too often
+    async def call(self, send, onRetry=None):
+        attempt = 1
+        while True:
+            try:
+                return await send()
+            except Exception as e:
+                retryable, _, retryAfter = classifyError(e)
+                if not retryable or attempt >= self.maxAttempts:
+                    raise
+                wait = self.delay(attempt, retryAfter)
+                if onRetry:
+                    onRetry(e, attempt, wait)
+                await asyncio.sleep(wait)
+                attempt += 1
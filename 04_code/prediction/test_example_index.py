@@ -0,0 +1,62 @@
+# Tests of the example index (example_index.py): a text of the trainset is
+# never chosen as its own few shot example.
+# Start: python -m unittest test_example_index
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+import tempfile
+import unittest
+from example_index import ExampleIndex, buildIndex
+
+TRAINSET = [
+    ("e1", "Frauen gehören in die Küche", "4-Extrem"),
+    ("e2", "Frauen gehören in die Küche und sonst nirgends", "3-Stark"),
+    ("e3", "Das Wetter ist heute schön", "0-Kein"),
+    ("e4", "Morgen regnet es in Wien", "0-Kein"),
+]
+
+
+class ExampleIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        dataPath = os.path.join(self.tmp.name, "train.jsonl")
+        with open(dataPath, 'w', encoding='utf-8') as file:
+            for key, text, label in TRAINSET:
+                file.write(json.dumps({
+                    "id": key, "text": text,
+                    "annotations": [{"user": "A001", "label": label}]
+                }) + '\n')
+        indexDir = os.path.join(self.tmp.name, "index")
+        buildIndex(dataPath, indexDir)
+        self.index = ExampleIndex(indexDir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ids(self, positions):
+        return [example['id']
+                for example in self.index.exampleList("A001", positions)]
+
+    def test_same_text_excluded(self):
+        [positions] = self.index.nearest("A001", [TRAINSET[0][1]], 2)
+        self.assertEqual(len(positions), 2)
+        self.assertNotIn("e1", self.ids(positions))
+        # the most similar example is the last one
+        self.assertEqual(self.ids(positions)[-1], "e2")
+
+    def test_same_id_excluded(self):
+        # the text was changed in the corpus to predict, the id is the same
+        [positions] = self.index.nearest(
+            "A001", ["Frauen gehören in die Küche!"], 2, ids=[["e1"]])
+        self.assertNotIn("e1", self.ids(positions))
+
+    def test_fewer_examples_than_n(self):
+        [positions] = self.index.nearest("A001", [TRAINSET[0][1]], 10)
+        self.assertEqual(sorted(self.ids(positions)), ["e2", "e3", "e4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
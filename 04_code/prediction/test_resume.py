@@ -0,0 +1,92 @@
+# Tests of the resume of the few shot strategies (checkpoint.py): the
+# answers in result.jsonl are restored per request (unit) of the strategy.
+# Start: python -m unittest test_resume
+
+# Date: October 17, 2026
+
+# import libraries
+import json
+import os
+import tempfile
+import unittest
+from checkpoint import checkpointPath, loadCheckpoint, prepareResume
+from prompts import FewShotPrompt, MultiAnnotatorPrompt
+
+# id -> (text, annotators, amount) like loadCorpus
+CORPUS = {
+    "t1": ("text 1", "A001, A002, A003", 3),
+    "t2": ("text 2", "A001, A002", 2),
+}
+# t1 was killed before A003 was answered
+RESULTS = [
+    {"id": "t1", "text": "text 1", "annotations": [
+        {"user": "A001", "label": "0-Kein"},
+        {"user": "A002", "label": "1-Gering"}]},
+    {"id": "t2", "text": "text 2", "annotations": [
+        {"user": "A001", "label": "2-Vorhanden"},
+        {"user": "A002", "label": "3-Stark"}]},
+]
+# usage per text and annotator, t2 A001 twice (flushed before a crash and
+# saved again)
+TOKENS = [("t1", "A001"), ("t1", "A002"), ("t2", "A001"), ("t2", "A001"),
+          ("t2", "A002")]
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.resultPath = os.path.join(self.tmp.name, "result.jsonl")
+        self.tokensPath = os.path.join(self.tmp.name, "result_token.jsonl")
+        with open(self.resultPath, 'w', encoding='utf-8') as file:
+            for entry in RESULTS:
+                file.write(json.dumps(entry) + '\n')
+        with open(self.tokensPath, 'w', encoding='utf-8') as file:
+            for key, user in TOKENS:
+                file.write(json.dumps({"id": key, "user": user,
+                                       "total_tokens": 10}) + '\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def tokenLines(self):
+        with open(self.tokensPath, 'r', encoding='utf-8') as file:
+            return [(entry["id"], entry["user"])
+                    for entry in map(json.loads, file)]
+
+    def resume(self, strategy):
+        return prepareResume(self.resultPath, self.tokensPath, CORPUS,
+                             strategy.units)
+
+    def test_few_shot(self):
+        doneIds, completed = self.resume(FewShotPrompt("prompt"))
+        self.assertEqual(doneIds, {"t2"})
+        self.assertEqual(set(completed["t1"]), {"A001", "A002"})
+        self.assertEqual(completed["t1"]["A002"],
+                         [{"user": "A002", "label": "1-Gering"}])
+        self.assertEqual(self.tokenLines(), [("t1", "A001"), ("t1", "A002"),
+                                             ("t2", "A001"), ("t2", "A002")])
+
+    def test_multi_annotator(self):
+        doneIds, completed = self.resume(
+            MultiAnnotatorPrompt("prompt", groupSize=2))
+        self.assertEqual(doneIds, {"t2"})
+        # units of t1: (A001, A002) answered, (A003) still missing
+        self.assertEqual(completed["t1"], {"A001, A002": RESULTS[0][
+            "annotations"]})
+        self.assertEqual(
+            loadCheckpoint(checkpointPath(self.resultPath))["t1"],
+            completed["t1"])
+        self.assertEqual(self.tokenLines(), [("t1", "A001"), ("t1", "A002"),
+                                             ("t2", "A001"), ("t2", "A002")])
+
+    def test_multi_annotator_partial_unit(self):
+        # one unit with all annotators of t1: A003 is missing, so the whole
+        # request is sent again and its usage is removed
+        doneIds, completed = self.resume(MultiAnnotatorPrompt("prompt"))
+        self.assertEqual(doneIds, {"t2"})
+        self.assertEqual(completed["t1"], {})
+        self.assertEqual(self.tokenLines(), [("t2", "A001"), ("t2", "A002")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# Buffered writer for the output files of a prediction run (result.jsonl,
+# result_token.jsonl, errors.jsonl and the checkpoint). The files stay
+# open for the whole run; lines are collected and written after maxLines
+# lines or maxDelay seconds, but only after a complete text (saveResponse) or
+# an error, never in the middle of a text. The token lines are written first,
+# then the checkpoint and the result: after a crash every saved annotation
+# has its token line, token lines without annotation are removed on resume
+# (see checkpoint.py). checkpoint() also writes the files to disk (fsync), so
+# everything written before survives a crash. Safe to use from several
+# threads.
+
+# Date: October 17, 2026
+
+# import libraries
+import datetime
+import json
+import os
+import threading
+import time
+
+
+class OutputWriter:
+    def __init__(self, resultPath, resultTokensPath, errorPath,
+                 checkpointFile, maxLines=256, maxDelay=5.0, verbose=False):
+        self.files = {
+            "result": open(resultPath, 'a', encoding='utf-8'),
+            "tokens": open(resultTokensPath, 'a', encoding='utf-8'),
+            "error": open(errorPath, 'a', encoding='utf-8'),
+            "checkpoint": open(checkpointFile, 'a', encoding='utf-8'),
+        }
+        # lines not written yet per file
+        self.buffers = {stream: [] for stream in self.files}
+        self.maxLines = maxLines
+        self.maxDelay = maxDelay
+        self.verbose = verbose
+        self.pending = 0
+        self.lastFlush = time.monotonic()
+        self.lock = threading.Lock()
+
+    # collect a line; with boundary (end of a text or an error) the lines are
+    # written if there are enough of them or maxDelay is over
+    def write(self, stream, line, boundary=False):
+        with self.lock:
+            self.buffers[stream].append(line)
+            self.pending += 1
+            if boundary and (self.pending >= self.maxLines or
+                             time.monotonic() - self.lastFlush >
+                             self.maxDelay):
+                self.flushLocked()
+
+    def writeJson(self, stream, data, boundary=False):
+        self.write(stream, json.dumps(data, ensure_ascii=False) + '\n',
+                   boundary)
+
+    # save the model response; answerList contains the annotations of every
+    # request of the text
+    def saveResponse(self, answerList, key, text):
+        transformed_list = []
+        for annotations in answerList:
+            transformed_list.extend(annotations)
+        data = {
+            "id": key,
+            "text": text,
+            "annotations": transformed_list
+        }
+        if self.verbose:
+            print(data)
+        self.writeJson("result", data, boundary=True)
+
+    # save the used tokens; with annotator the tokens are the share of this
+    # annotator
+    def saveTokens(self, promptTokens, totalTokens, completionTokens,
+                   key, text, annotator=None):
+        data = {
+            "id": key,
+            "text": text,
+            "totalTokens": totalTokens,
+            "promptTokens": promptTokens,
+            "completionTokens": completionTokens
+        }
+        if annotator is not None:
+            data["user"] = annotator
+        self.writeJson("tokens", data)
+
+    # structured error log, one JSON object per line: kind of the error
+    # (retry, request, response, finish_reason, batch), message and details
+    # like annotators, HTTP status or attempt
+    def writeError(self, key, kind, message, **details):
+        self.writeJson("error", {
+            "time": datetime.datetime.now().isoformat(),
+            "id": key,
+            "kind": kind,
+            "message": message,
+            **details
+        }, boundary=True)
+
+    # annotations of one request for the resume (see checkpoint.py)
+    def saveCheckpoint(self, key, annotator, annotations):
+        self.writeJson("checkpoint", {
+            "id": key,
+            "user": annotator,
+            "annotations": annotations
+        })
+
+    # tokens before checkpoint and result, see above
+    def flushLocked(self):
+        for stream in ("tokens", "checkpoint", "result", "error"):
+            if self.buffers[stream]:
+                self.files[stream].write("".join(self.buffers[stream]))
+                self.buffers[stream] = []
+            self.files[stream].flush()
+        self.pending = 0
+        self.lastFlush = time.monotonic()
+
+    def flush(self):
+        with self.lock:
+            self.flushLocked()
+
+    # flush and write everything to disk
+    def checkpoint(self):
+        with self.lock:
+            self.flushLocked()
+            for file in self.files.values():
+                os.fsync(file.fileno())
+
+    def close(self):
+        self.checkpoint()
+        with self.lock:
+            for file in self.files.values():
+                file.close()